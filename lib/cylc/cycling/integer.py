@@ -116,17 +116,39 @@ REC_INTERVAL = re.compile("^[-+]?P\d+$")
 
 class IntegerPoint(PointBase):
 
-    """A single point in an integer sequence."""
+    """A single point in an integer sequence.
+
+    The point is held as a native integer. Its string value is only
+    produced on demand, e.g. for the suite database, job environment and
+    network clients.
+
+    """
 
     TYPE = CYCLER_TYPE_INTEGER
     TYPE_SORT_KEY = CYCLER_TYPE_SORT_KEY_INTEGER
 
-    __slots__ = ('value')
+    __slots__ = ('_int', '_value')
 
     def __init__(self, value):
-        if isinstance(value, int):
-            value = str(value)
-        super(IntegerPoint, self).__init__(str(value))
+        if isinstance(value, (int, long)):
+            self._int = value
+            self._value = None
+        else:
+            self._int = None
+            super(IntegerPoint, self).__init__(str(value))
+
+    @property
+    def value(self):
+        """Return the string value of this point."""
+        if self._value is None:
+            self._value = str(self._int)
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        """Set the string value of this point."""
+        self._int = None
+        self._value = value
 
     def add(self, other):
         """Add other.value to self.value as integers."""
@@ -136,6 +158,14 @@ class IntegerPoint(PointBase):
         """Compare self.value to self.other as integers with 'cmp'."""
         return cmp(int(self), int(other))
 
+    def __cmp__(self, other):
+        # Compare to other point, as integers if possible.
+        if other is None:
+            return -1
+        if self.TYPE != other.TYPE:
+            return cmp(self.TYPE_SORT_KEY, other.TYPE_SORT_KEY)
+        return cmp(int(self), int(other))
+
     def sub(self, other):
         """Subtract other.value from self.value as integers."""
         if isinstance(other, IntegerPoint):
@@ -145,36 +175,40 @@ class IntegerPoint(PointBase):
     def standardise(self):
         """Format self.value into a standard representation and check it."""
         try:
-            self.value = str(int(self))
+            self._int = int(self)
         except (TypeError, ValueError) as exc:
             raise PointParsingError(type(self), self.value, exc)
+        self._value = None
         return self
 
     def __int__(self):
-        # Provide a nice way to use the string self.value in calculations.
-        return int(self.value)
+        # Provide a nice way to use the point in calculations.
+        if self._int is None:
+            self._int = int(self._value)
+        return self._int
 
     def __hash__(self):
-        return hash(self.value)
+        return hash(int(self))
 
 
 class IntegerInterval(IntervalBase):
 
-    """The interval between points in an integer sequence."""
+    """The interval between points in an integer sequence.
+
+    Like IntegerPoint, the interval is held as a native integer, and its
+    string value (e.g. "P3", "-P1") is only produced on demand.
+
+    """
 
     TYPE = CYCLER_TYPE_INTEGER
     TYPE_SORT_KEY = CYCLER_TYPE_SORT_KEY_INTEGER
 
-    __slots__ = ('value')
+    __slots__ = ('_int', '_value')
 
     @classmethod
     def from_integer(cls, integer):
         """Return an instance of this class using integer."""
-        if integer < 0:
-            value = "-P" + str(abs(integer))
-        else:
-            value = "P" + str(integer)
-        return IntegerInterval(value)
+        return IntegerInterval(integer)
 
     @classmethod
     def get_null(cls):
@@ -194,11 +228,32 @@ class IntegerInterval(IntervalBase):
             return IntegerInterval(string)
 
     def __init__(self, value):
+        if isinstance(value, (int, long)):
+            self._int = value
+            self._value = None
+            return
         if (not isinstance(value, basestring) or
                 not REC_INTERVAL.search(value)):
             raise IntervalParsingError("IntegerInterval", repr(value))
+        self._int = None
         super(IntegerInterval, self).__init__(value)
 
+    @property
+    def value(self):
+        """Return the string value of this interval."""
+        if self._value is None:
+            if self._int < 0:
+                self._value = "-P" + str(abs(self._int))
+            else:
+                self._value = "P" + str(self._int)
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        """Set the string value of this interval."""
+        self._int = None
+        self._value = value
+
     def add(self, other):
         """Add other to self as integers (point or interval)."""
         if isinstance(other, IntegerInterval):
@@ -209,6 +264,12 @@ class IntegerInterval(IntervalBase):
         """Compare other to self as integers."""
         return cmp(int(self), int(other))
 
+    def __cmp__(self, other):
+        # Compare self to other (interval), as integers if possible.
+        if self.TYPE != other.TYPE:
+            return cmp(self.TYPE_SORT_KEY, other.TYPE_SORT_KEY)
+        return cmp(int(self), int(other))
+
     def sub(self, other):
         """Subtract other from self as integers."""
         return IntegerInterval.from_integer(int(self) - int(other))
@@ -218,8 +279,10 @@ class IntegerInterval(IntervalBase):
         return IntegerInterval.from_integer(abs(int(self)))
 
     def __int__(self):
-        # Provide a nice way to use the string self.value in calculations.
-        return int(self.value.replace("P", ""))
+        # Provide a nice way to use the interval in calculations.
+        if self._int is None:
+            self._int = int(self._value.replace("P", ""))
+        return self._int
 
     def __mul__(self, factor):
         # Return an interval with all properties multiplied by factor.
@@ -234,7 +297,7 @@ class IntegerExclusions(ExclusionBase):
     """A collection of integer exclusion points, or sequences of
     integers that are treated in an exclusionary manner."""
 
-    __slots__ = ExclusionBase.__slots__
+    __slots__ = ExclusionBase.__slots__ + ('exclusion_ints',)
 
     def __init__(self, excl_points, start_point, end_point=None):
         """creates an exclusions object that can contain integer points
@@ -242,6 +305,17 @@ class IntegerExclusions(ExclusionBase):
         super(IntegerExclusions, self).__init__(start_point, end_point)
 
         self.build_exclusions(excl_points)
+        self.exclusion_ints = set(
+            int(point) for point in self.exclusion_points)
+
+    def __contains__(self, point):
+        """Return True if point is an exclusion point or is in any of the
+        exclusion sequences, using integer arithmetic only."""
+        if point is None:
+            return False
+        if int(point) in self.exclusion_ints:
+            return True
+        return any(seq.is_valid(point) for seq in self.exclusion_sequences)
 
     def build_exclusions(self, excl_points):
         for point in excl_points:
@@ -408,8 +482,7 @@ class IntegerSequence(SequenceBase):
             remainder = (
                 int(self.p_context_stop - self.p_start) % int(self.i_step))
             self.p_stop = (
-                self.p_context_stop - self.i_step +
-                IntegerInterval.from_interval(remainder)
+                self.p_context_stop - IntegerInterval.from_integer(remainder)
             )
             # if i_step is None here, points will just be None (out of bounds)
 
@@ -460,7 +533,7 @@ class IntegerSequence(SequenceBase):
         if self.exclusions and point in self.exclusions:
             return False
         if self.i_step:
-            return int(point - self.p_start) % int(self.i_step) == 0
+            return (int(point) - int(self.p_start)) % int(self.i_step) == 0
         else:
             return point == self.p_start
 
@@ -486,12 +559,9 @@ class IntegerSequence(SequenceBase):
             # implies a one-off task was declared sequential
             # TODO - check this results in sensible behaviour
             return None
-        i = int(point - self.p_start) % int(self.i_step)
-        if i:
-            prev_point = point - IntegerInterval.from_integer(i)
-        else:
-            prev_point = point - self.i_step
-        ret = self._get_point_in_bounds(prev_point)
+        step = int(self.i_step)
+        i = (int(point) - int(self.p_start)) % step
+        ret = self._get_point_in_bounds(IntegerPoint(int(point) - (i or step)))
         if self.exclusions and ret in self.exclusions:
             return self.get_prev_point(ret)
         return ret
@@ -500,16 +570,21 @@ class IntegerSequence(SequenceBase):
         """Return the largest point < some arbitrary point."""
         if self.is_on_sequence(point):
             return self.get_prev_point(point)
-        sequence_point = self._get_point_in_bounds(self.p_start)
-        prev_point = None
-        while sequence_point is not None:
-            if sequence_point > point:
-                # Technically, >=, but we already test for this above.
-                break
-            prev_point = sequence_point
-            sequence_point = self.get_next_point(sequence_point)
+        if not self.i_step:
+            # this is a one-off sequence
+            if self.p_start < point:
+                return self._get_point_in_bounds(self.p_start)
+            return None
+        # The point may be on the grid of the sequence but excluded.
+        step = int(self.i_step)
+        start = int(self.p_start)
+        prev_int = int(point) - ((int(point) - start) % step or step)
+        if self.p_stop is not None and prev_int > int(self.p_stop):
+            # Last on-sequence point <= stop point.
+            prev_int = int(self.p_stop) - (int(self.p_stop) - start) % step
+        prev_point = self._get_point_in_bounds(IntegerPoint(prev_int))
         if self.exclusions and prev_point in self.exclusions:
-            return self.get_nearest_prev_point(prev_point)
+            return self.get_prev_point(prev_point)
         return prev_point
 
     def get_next_point(self, point):
@@ -521,8 +596,13 @@ class IntegerSequence(SequenceBase):
                 return self.p_start
             else:
                 return None
-        i = int(point - self.p_start) % int(self.i_step)
-        next_point = point + self.i_step - IntegerInterval.from_integer(i)
+        start = int(self.p_start)
+        if int(point) < start:
+            next_point = IntegerPoint(start)
+        else:
+            step = int(self.i_step)
+            next_point = IntegerPoint(
+                int(point) + step - (int(point) - start) % step)
         ret = self._get_point_in_bounds(next_point)
         if self.exclusions and ret and ret in self.exclusions:
             return self.get_next_point(ret)
@@ -733,6 +813,39 @@ class TestIntegerSequence(unittest.TestCase):
         sequence = IntegerSequence('R/P1!5', 1, 5)
         self.assertEqual(sequence.get_stop_point(), point_4)
 
+    def test_arithmetic_navigation(self):
+        """Test IntegerSequence methods far from the start of a sequence."""
+        sequence = IntegerSequence('P3!(100000, P9)', 1)
+        point = IntegerPoint(100000)
+        self.assertFalse(sequence.is_on_sequence(point))
+        self.assertFalse(sequence.is_on_sequence(IntegerPoint(100009)))
+        self.assertTrue(sequence.is_on_sequence(IntegerPoint(100003)))
+        self.assertEqual(sequence.get_nearest_prev_point(point),
+                         IntegerPoint(99997))
+        self.assertEqual(sequence.get_nearest_prev_point(IntegerPoint(100011)),
+                         IntegerPoint(100006))
+        self.assertEqual(sequence.get_next_point(point), IntegerPoint(100003))
+        self.assertEqual(sequence.get_first_point(IntegerPoint(100008)),
+                         IntegerPoint(100012))
+        # 1 is excluded by P9.
+        self.assertEqual(sequence.get_next_point(IntegerPoint(-5)),
+                         IntegerPoint(4))
+
+        sequence = IntegerSequence('R5/1/P2', 1, 6)
+        self.assertEqual(sequence.get_stop_point(), IntegerPoint(5))
+        self.assertEqual(sequence.get_nearest_prev_point(IntegerPoint(8)),
+                         IntegerPoint(5))
+
+    def test_native_int(self):
+        """Test that points and intervals are held as integers."""
+        point = IntegerPoint('007').standardise()
+        self.assertEqual(point.value, '7')
+        self.assertEqual(point, IntegerPoint(7))
+        self.assertEqual(hash(point), hash(IntegerPoint(7)))
+        self.assertEqual(str(point + IntegerInterval('-P10')), '-3')
+        self.assertEqual(str(IntegerInterval.from_integer(-2)), '-P2')
+        self.assertEqual(IntegerPoint(9) - point, IntegerInterval('P2'))
+
     def test_simple(self):
         """Run some simple tests for integer cycling."""
         sequence = IntegerSequence('R/1/P3', 1, 10)
@@ -18,11 +18,13 @@
 
 """Date-time cycling by point, interval, and sequence classes."""
 
+from collections import OrderedDict
 import re
 import unittest
 
-from isodatetime.data import Calendar, Duration
-from isodatetime.dumpers import TimePointDumper
+from isodatetime.data import (
+    Calendar, Duration, get_days_in_year_range, get_days_since_1_ad)
+from isodatetime.dumpers import TimePointDumper, TimePointDumperBoundsError
 from isodatetime.parsers import TimePointParser, DurationParser
 from isodatetime.timezone import (
     get_local_time_zone, get_local_time_zone_format)
@@ -63,34 +65,45 @@ def memoize(function):
     The inputs and results of the function must be immutable.
     Keyword arguments are not allowed.
 
-    To avoid memory leaks, only the first 10000 separate input
-    permutations are cached for a given function.
+    To avoid memory leaks, only the 10000 most recently used separate
+    input permutations are cached for a given function.
 
     """
-    inputs_results = {}
+    inputs_results = OrderedDict()
 
     def _wrapper(*args):
         """Cache results for function(*args)."""
         try:
-            return inputs_results[args]
+            # Re-insert below, to mark as most recently used.
+            results = inputs_results.pop(args)
         except KeyError:
             results = function(*args)
-            if len(inputs_results) > MEMOIZE_LIMIT:
-                # Full up, no more room.
-                inputs_results.popitem()
-            inputs_results[args] = results
-            return results
+            if len(inputs_results) >= MEMOIZE_LIMIT:
+                # Full up, discard the least recently used.
+                inputs_results.popitem(last=False)
+        inputs_results[args] = results
+        return results
     return _wrapper
 
 
 class ISO8601Point(PointBase):
 
-    """A single point in an ISO8601 date time sequence."""
+    """A single point in an ISO8601 date time sequence.
+
+    Alongside its string value, a point has a numeric canonical form (see
+    "get_key"), computed on demand, which is used for comparison and
+    hashing.
+
+    """
 
     TYPE = CYCLER_TYPE_ISO8601
     TYPE_SORT_KEY = CYCLER_TYPE_SORT_KEY_ISO8601
 
-    __slots__ = ('value')
+    __slots__ = ('value', '_key')
+
+    def __init__(self, value):
+        super(ISO8601Point, self).__init__(value)
+        self._key = None
 
     @classmethod
     def from_nonstandard_string(cls, point_string):
@@ -109,10 +122,22 @@ class ISO8601Point(PointBase):
             return cmp(self.TYPE_SORT_KEY, other.TYPE_SORT_KEY)
         if self.value == other.value:
             return 0
-        return self._iso_point_cmp(self.value, other.value)
+        return cmp(self.get_key(), other.get_key())
+
+    def get_key(self):
+        """Return the numeric canonical form of this point.
+
+        This is the number of seconds since 0001-01-01T00:00Z in the
+        calendar in use, so it is independent of the time zone of the point.
+
+        """
+        if self._key is None:
+            self._key = _get_point_key(self.value, Calendar.default().mode)
+        return self._key
 
     def standardise(self):
         """Reformat self.value into a standard representation."""
+        self._key = None
         try:
             self.value = str(point_parse(self.value))
         except ValueError as exc:
@@ -133,7 +158,7 @@ class ISO8601Point(PointBase):
             self._iso_point_sub_interval(self.value, other.value))
 
     def __hash__(self):
-        return hash(self.value)
+        return hash(self.get_key())
 
     @staticmethod
     @memoize
@@ -143,14 +168,6 @@ class ISO8601Point(PointBase):
         interval = interval_parse(interval_string)
         return str(point + interval)
 
-    @staticmethod
-    @memoize
-    def _iso_point_cmp(point_string, other_point_string):
-        """Compare the parsed point_string to the other one."""
-        point = point_parse(point_string)
-        other_point = point_parse(other_point_string)
-        return cmp(point, other_point)
-
     @staticmethod
     @memoize
     def _iso_point_sub_interval(point_string, interval_string):
@@ -331,7 +348,8 @@ class ISO8601Sequence(SequenceBase):
                  'offset', '_cached_first_point_values',
                  '_cached_next_point_values', '_cached_valid_point_booleans',
                  '_cached_recent_valid_points', 'spec', 'abbrev_util',
-                 'recurrence', 'exclusions', 'step', 'value')
+                 'recurrence', 'exclusions', 'step', 'value',
+                 '_step_seconds', '_start_key', '_last_index')
 
     @classmethod
     def get_async_expr(cls, start_point=None):
@@ -362,9 +380,9 @@ class ISO8601Sequence(SequenceBase):
 
         self.offset = ISO8601Interval.get_null()
 
-        self._cached_first_point_values = {}
-        self._cached_next_point_values = {}
-        self._cached_valid_point_booleans = {}
+        self._cached_first_point_values = OrderedDict()
+        self._cached_next_point_values = OrderedDict()
+        self._cached_valid_point_booleans = OrderedDict()
         self._cached_recent_valid_points = []
 
         self.spec = dep_section
@@ -375,6 +393,7 @@ class ISO8601Sequence(SequenceBase):
         # and a list of exclusion strings.
         self.recurrence, excl_points = self.abbrev_util.parse_recurrence(
             dep_section)
+        self._set_regular_recurrence()
 
         # Determine the exclusion start point and end point
         try:
@@ -421,9 +440,10 @@ class ISO8601Sequence(SequenceBase):
             self.recurrence.start_point += interval_parse(str(offset))
         if self.recurrence.end_point is not None:
             self.recurrence.end_point += interval_parse(str(offset))
-        self._cached_first_point_values = {}
-        self._cached_next_point_values = {}
-        self._cached_valid_point_booleans = {}
+        self._set_regular_recurrence()
+        self._cached_first_point_values = OrderedDict()
+        self._cached_next_point_values = OrderedDict()
+        self._cached_valid_point_booleans = OrderedDict()
         self._cached_recent_valid_points = []
         self.value = str(self.recurrence) + '!' + str(self.exclusions)
         if self.exclusions:
@@ -435,6 +455,12 @@ class ISO8601Sequence(SequenceBase):
         if self.exclusions and point in self.exclusions:
             return False
 
+        if self._step_seconds is not None:
+            index, remainder = divmod(
+                point.get_key() - self._start_key, self._step_seconds)
+            return (not remainder and index >= 0 and (
+                self._last_index is None or index <= self._last_index))
+
         for valid_point in reversed(self._cached_recent_valid_points):
             if valid_point == point:
                 return True
@@ -457,7 +483,7 @@ class ISO8601Sequence(SequenceBase):
             is_valid = self.is_on_sequence(point)
             if (len(self._cached_valid_point_booleans) >
                     self._MAX_CACHED_POINTS):
-                self._cached_valid_point_booleans.popitem()
+                self._cached_valid_point_booleans.popitem(last=False)
             self._cached_valid_point_booleans[point.value] = is_valid
             return is_valid
 
@@ -484,21 +510,29 @@ class ISO8601Sequence(SequenceBase):
         """Return the largest point < some arbitrary point."""
         if self.is_on_sequence(point):
             return self.get_prev_point(point)
-        p_iso_point = point_parse(point.value)
-        prev_iso_point = None
-
-        for recurrence_iso_point in self.recurrence:
-            # Is recurrence point greater than aribitrary point?
-            if (
-                    recurrence_iso_point > p_iso_point or
-                    (self.exclusions and
-                     recurrence_iso_point in self.exclusions.p_iso_exclusions)
-            ):
-                break
-            prev_iso_point = recurrence_iso_point
-        if prev_iso_point is None:
+        if self._step_seconds is not None:
+            index = self._get_regular_index(point.get_key(), ceil=True) - 1
+            if self._last_index is not None:
+                index = min(index, self._last_index)
+            nearest_point = self._get_regular_point(index)
+        else:
+            p_iso_point = point_parse(point.value)
+            prev_iso_point = None
+            for recurrence_iso_point in self.recurrence:
+                # Is recurrence point greater than aribitrary point?
+                if (
+                        recurrence_iso_point > p_iso_point or
+                        (self.exclusions and
+                         recurrence_iso_point in
+                         self.exclusions.p_iso_exclusions)
+                ):
+                    break
+                prev_iso_point = recurrence_iso_point
+            if prev_iso_point is None:
+                return None
+            nearest_point = ISO8601Point(str(prev_iso_point))
+        if nearest_point is None:
             return None
-        nearest_point = ISO8601Point(str(prev_iso_point))
         if nearest_point == point:
             raise SequenceDegenerateError(
                 self.recurrence, SuiteSpecifics.DUMP_FORMAT,
@@ -515,6 +549,14 @@ class ISO8601Sequence(SequenceBase):
             return ISO8601Point(self._cached_next_point_values[point.value])
         except KeyError:
             pass
+        if self._step_seconds is not None:
+            next_point = self._get_regular_point(
+                max(self._get_regular_index(point.get_key()) + 1, 0))
+            if next_point is not None and next_point in self.exclusions:
+                next_point = self.get_next_point_on_sequence(next_point)
+            if next_point is not None:
+                self._check_and_cache_next_point(point, next_point)
+            return next_point
         # Iterate starting at recent valid points, for speed.
         for valid_point in reversed(self._cached_recent_valid_points):
             if valid_point >= point:
@@ -552,11 +594,11 @@ class ISO8601Sequence(SequenceBase):
         # Cache the answer for point -> next_point.
         if (len(self._cached_next_point_values) >
                 self._MAX_CACHED_POINTS):
-            self._cached_next_point_values.popitem()
+            self._cached_next_point_values.popitem(last=False)
         self._cached_next_point_values[point.value] = next_point.value
 
         # Cache next_point as a valid starting point for this recurrence.
-        if (len(self._cached_next_point_values) >
+        if (len(self._cached_recent_valid_points) >
                 self._MAX_CACHED_POINTS):
             self._cached_recent_valid_points.pop(0)
         self._cached_recent_valid_points.append(next_point)
@@ -584,21 +626,26 @@ class ISO8601Sequence(SequenceBase):
             return ISO8601Point(self._cached_first_point_values[point.value])
         except KeyError:
             pass
-        p_iso_point = point_parse(point.value)
-        for recurrence_iso_point in self.recurrence:
-            if recurrence_iso_point >= p_iso_point:
-                first_point_value = str(recurrence_iso_point)
-                ret = ISO8601Point(first_point_value)
-                # Check multiple exclusions
-                if ret and ret in self.exclusions:
-                    return self.get_next_point_on_sequence(ret)
-                if (len(self._cached_first_point_values) >
-                        self._MAX_CACHED_POINTS):
-                    self._cached_first_point_values.popitem()
-                self._cached_first_point_values[point.value] = (
-                    first_point_value)
-                return ret
-        return None
+        ret = None
+        if self._step_seconds is not None:
+            ret = self._get_regular_point(
+                max(self._get_regular_index(point.get_key(), ceil=True), 0))
+        else:
+            p_iso_point = point_parse(point.value)
+            for recurrence_iso_point in self.recurrence:
+                if recurrence_iso_point >= p_iso_point:
+                    ret = ISO8601Point(str(recurrence_iso_point))
+                    break
+        if ret is None:
+            return None
+        # Check multiple exclusions
+        if ret in self.exclusions:
+            return self.get_next_point_on_sequence(ret)
+        if (len(self._cached_first_point_values) >
+                self._MAX_CACHED_POINTS):
+            self._cached_first_point_values.popitem(last=False)
+        self._cached_first_point_values[point.value] = ret.value
+        return ret
 
     def get_start_point(self):
         """Return the first point in this sequence, or None."""
@@ -611,6 +658,13 @@ class ISO8601Sequence(SequenceBase):
 
     def get_stop_point(self):
         """Return the last point in this sequence, or None if unbounded."""
+        if self._step_seconds is not None:
+            if self._last_index is None:
+                return None
+            ret = self._get_regular_point(self._last_index)
+            if self.exclusions and ret in self.exclusions:
+                return self.get_prev_point(ret)
+            return ret
         if (self.recurrence.repetitions is not None or (
                 (self.recurrence.start_point is not None or
                  self.recurrence.min_point is not None) and
@@ -627,6 +681,73 @@ class ISO8601Sequence(SequenceBase):
             return ret
         return None
 
+    def _set_regular_recurrence(self):
+        """Set up arithmetic navigation, if the recurrence is regular.
+
+        A recurrence is regular if it runs forward from its start point in
+        steps of a fixed number of seconds, i.e. its interval has no year or
+        month components. The nth point is then simply start + n * step, and
+        we do not need to iterate over the recurrence to find points in it.
+
+        """
+        self._step_seconds = None
+        self._start_key = None
+        self._last_index = None
+        recurrence = self.recurrence
+        duration = recurrence.duration
+        if (recurrence.format_number not in [3, 4] or
+                recurrence.start_point is None or
+                recurrence.start_point.truncated or
+                recurrence.repetitions == 1 or
+                duration.years or duration.months or
+                duration.get_seconds() <= 0 or
+                not recurrence.get_is_valid(recurrence.start_point)):
+            return
+        # Use the keys of the point strings, which may be lossy in a custom
+        # dump format, for consistency with the points of the sequence.
+        try:
+            start_key = ISO8601Point(str(recurrence.start_point)).get_key()
+            bound_keys = [
+                ISO8601Point(str(bound)).get_key()
+                for bound in [recurrence.end_point, recurrence.max_point]
+                if bound is not None]
+        except TimePointDumperBoundsError:
+            # Leave out of range points to the iterative methods, which
+            # report them when the points are actually used.
+            return
+        self._step_seconds = duration.get_seconds()
+        self._start_key = start_key
+        for key in bound_keys:
+            index = self._get_regular_index(key)
+            if self._last_index is None or index < self._last_index:
+                self._last_index = index
+
+    def _get_regular_index(self, key, ceil=False):
+        """Return the index of the last point at or before key.
+
+        Or the index of the first point at or after key, if ceil is True.
+        Key is the number of seconds since 0001-01-01T00:00Z. The index may
+        be out of bounds.
+
+        """
+        index, remainder = divmod(key - self._start_key, self._step_seconds)
+        if ceil and remainder:
+            index += 1
+        return int(index)
+
+    def _get_regular_point(self, index):
+        """Return the point at index, or None if out of bounds."""
+        if index < 0 or (
+                self._last_index is not None and index > self._last_index):
+            return None
+        step = self.recurrence.duration.copy()
+        step.to_days()
+        return ISO8601Point(str(self.recurrence.start_point + Duration(
+            days=(step.days or 0) * index,
+            hours=(step.hours or 0) * index,
+            minutes=(step.minutes or 0) * index,
+            seconds=(step.seconds or 0) * index)))
+
     def __eq__(self, other):
         # Return True if other (sequence) is equal to self.
         if self.TYPE != other.TYPE:
@@ -768,6 +889,25 @@ def point_parse(point_string):
     return _point_parse(point_string).copy()
 
 
+@memoize
+def _get_point_key(point_string, _):
+    """Return the number of seconds since 0001-01-01T00:00Z to point_string.
+
+    The second argument should be the calendar mode, which determines the
+    result, but is used only to key the cache.
+
+    """
+    point = point_parse(point_string)
+    point.set_time_zone_to_utc()
+    year, day_of_year = point.get_ordinal_date()
+    if year >= 1:
+        days = get_days_since_1_ad(year - 1)
+    else:
+        days = -get_days_in_year_range(year, 0)
+    days += day_of_year - 1
+    return days * 86400 + point.get_second_of_day()
+
+
 @memoize
 def _point_parse(point_string):
     """Parse a point_string into a proper TimePoint object."""
@@ -782,6 +922,41 @@ def _point_parse(point_string):
     return SuiteSpecifics.point_parser.parse(point_string)
 
 
+class TestISO8601Point(unittest.TestCase):
+    """Contains unit tests for the ISO8601Point class."""
+
+    def tearDown(self):
+        Calendar.default().set_mode()
+
+    def test_key_compare(self):
+        """Test comparison of points by their numeric canonical form."""
+        init(time_zone='Z')
+        points = [ISO8601Point(value) for value in [
+            '20000101T0000Z', '19991231T2300Z', '20000101T0000+01',
+            '20000228T1200Z', '00010101T0000Z']]
+        self.assertEqual(
+            [str(point) for point in sorted(points)],
+            ['00010101T0000Z', '19991231T2300Z', '20000101T0000+01',
+             '20000101T0000Z', '20000228T1200Z'])
+        self.assertEqual(points[1], points[2])
+        self.assertEqual(hash(points[1]), hash(points[2]))
+        self.assertEqual(points[0].get_key() - points[1].get_key(), 3600)
+        self.assertEqual(points[4].get_key(), 0)
+
+    def test_key_360_day_calendar(self):
+        """Test the numeric canonical form in the 360 day calendar."""
+        init(time_zone='Z', cycling_mode='360day')
+        point = ISO8601Point('20000230T0000Z')
+        next_point = ISO8601Point('20000301T0000Z')
+        self.assertEqual(next_point.get_key() - point.get_key(), 86400)
+        self.assertEqual(
+            ISO8601Point('20010101T0000Z').get_key() -
+            ISO8601Point('20000101T0000Z').get_key(),
+            360 * 86400)
+        self.assertTrue(point < next_point)
+        self.assertEqual(point + ISO8601Interval('P1D'), next_point)
+
+
 class TestISO8601Sequence(unittest.TestCase):
     """Contains unit tests for the ISO8601Sequence class."""
 
@@ -1237,6 +1412,38 @@ class TestISO8601Sequence(unittest.TestCase):
         self.assertEqual(sequence.get_prev_point(point_3), point_1)
         self.assertEqual(sequence.get_prev_point(point_4), point_1)
 
+    def test_regular_far_from_start(self):
+        """Test navigation of regular sequences far from their start."""
+        init(time_zone='Z')
+        sequence = ISO8601Sequence('PT1H!T02', '10000101T00Z')
+        self.assertIsNotNone(sequence._step_seconds)
+        point = ISO8601Point('20170101T0130Z')
+        self.assertEqual(str(sequence.get_first_point(point)),
+                         '20170101T0300Z')
+        self.assertEqual(str(sequence.get_next_point(point)),
+                         '20170101T0300Z')
+        self.assertEqual(str(sequence.get_nearest_prev_point(point)),
+                         '20170101T0100Z')
+        self.assertTrue(sequence.is_on_sequence(ISO8601Point('20170101T03Z')))
+        self.assertFalse(
+            sequence.is_on_sequence(ISO8601Point('20170101T02Z')))
+        self.assertIsNone(sequence.get_stop_point())
+
+        sequence = ISO8601Sequence('R900/T06/P1W', '20000101T00Z')
+        self.assertEqual(str(sequence.get_stop_point()), '20170325T0600Z')
+        self.assertIsNone(
+            sequence.get_next_point(ISO8601Point('20170325T0600Z')))
+        self.assertEqual(
+            str(sequence.get_first_point(ISO8601Point('20170320T00Z'))),
+            '20170325T0600Z')
+
+        # Months and years are irregular, so these are iterated.
+        sequence = ISO8601Sequence('P1M', '20000131T00Z')
+        self.assertIsNone(sequence._step_seconds)
+        self.assertEqual(
+            str(sequence.get_first_point(ISO8601Point('20000201T00Z'))),
+            '20000229T0000Z')
+
     def test_simple(self):
         """Run some simple tests for date-time cycling."""
         init(time_zone='Z')
@@ -31,6 +31,7 @@ from cylc.dump import get_stop_state_summary
 from cylc.gui.cat_state import cat_state
 from cylc.gui.warning_dialog import warning_dialog
 from cylc.network.httpclient import SuiteRuntimeServiceClient, ClientError
+from cylc.state_summary_mgr import apply_state_summary_delta
 from cylc.suite_status import (
     SUITE_STATUS_NOT_CONNECTED, SUITE_STATUS_CONNECTED,
     SUITE_STATUS_INITIALISING, SUITE_STATUS_STOPPED, SUITE_STATUS_STOPPING
@@ -72,6 +73,11 @@ class Updater(threading.Thread):
         self.ancestors_pruned = {}
         self.descendants = {}
         self.stop_summary = None
+        # Unfiltered task and family summaries from the suite, and the
+        # sequence number of the suite's state summary.
+        self.suite_state_summary = {}
+        self.suite_fam_state_summary = {}
+        self.summary_seq_num = None
 
         self.mode = "waiting..."
         self.update_time_str = "waiting..."
@@ -120,6 +126,9 @@ class Updater(threading.Thread):
         self.full_fam_state_summary = {}
         self.all_families = {}
         self.global_summary = {}
+        self.suite_state_summary = {}
+        self.suite_fam_state_summary = {}
+        self.summary_seq_num = None
         self.cfg.port = None
         self.client = None
 
@@ -239,7 +248,10 @@ class Updater(threading.Thread):
                 self.cfg.suite, self.cfg.owner, self.cfg.host, self.cfg.port,
                 self.cfg.comms_timeout, self.cfg.my_uuid)
         try:
-            my_state = self.client.get_latest_state(full_mode=self.full_mode)
+            if self.full_mode:
+                self.summary_seq_num = None
+            my_state = self.client.get_latest_state(
+                full_mode=self.full_mode, summary_seq_num=self.summary_seq_num)
         except ClientError:
             # Bad credential, suite not running, starting up or just stopped?
             if cylc.flags.debug:
@@ -283,9 +295,15 @@ class Updater(threading.Thread):
             self.descendants = my_state['descendants']
             self.all_families = list(self.descendants)
             is_updated = True
+        if 'summary_delta' in my_state:
+            my_state['summary'] = apply_state_summary_delta(
+                self.suite_state_summary, self.suite_fam_state_summary,
+                my_state['summary_delta'])
         if 'summary' in my_state and my_state['summary'][0]:
             self._update_state_summary(my_state)
             is_updated = True
+        if 'summary_seq_num' in my_state:
+            self.summary_seq_num = my_state['summary_seq_num']
         if self.status in [SUITE_STATUS_INITIALISING, SUITE_STATUS_STOPPING]:
             gobject.idle_add(self.info_bar.prog_bar_start, self.status)
         elif self.is_reloading:
@@ -321,6 +339,8 @@ class Updater(threading.Thread):
     def _update_state_summary(self, my_state):
         """Display suite summary."""
         glbl, states, fam_states = my_state['summary']
+        self.suite_state_summary = states
+        self.suite_fam_state_summary = fam_states
         self.mode = glbl['run_mode']
 
         if self.cfg.use_defn_order:
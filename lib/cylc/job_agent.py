@@ -0,0 +1,415 @@
+#!/usr/bin/env python
+
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2017 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Long-lived job management agents on remote job hosts.
+
+Without an agent, each batch of job submit, poll or kill commands for a
+remote user@host runs a new "cylc jobs-submit|jobs-poll|jobs-kill" over a
+new SSH connection. A job agent is a "cylc jobs-agent" process, started once
+per user@host over a single SSH connection, which runs these commands in
+process for as long as the connection stays up.
+
+Requests and responses are framed on the standard input and output of the
+agent. Each frame is a JSON header line, followed by a payload of the sizes
+given in the header:
+* request: {"id": ID, "argv": ARGV, "stdin_size": N} + N bytes of STDIN,
+  where ARGV is the command line of the job command without "cylc" and
+  without the remote host and user options.
+* response: {"id": ID, "ret_code": RET_CODE, "out_size": N, "err_size": M}
+  + N bytes of STDOUT + M bytes of STDERR of the job command.
+The STDOUT of a job command is the same as when it is run as a separate
+command, i.e. lines in the "[TASK JOB SUMMARY]" format, etc.
+"""
+
+from collections import OrderedDict
+import errno
+import fcntl
+import json
+import os
+from StringIO import StringIO
+from signal import SIGKILL
+from subprocess import Popen, PIPE
+import sys
+from tempfile import mkdtemp
+from time import time
+import traceback
+import unittest
+
+import cylc.flags
+from cylc.wallclock import get_current_time_string
+
+
+JOB_COMMANDS = ['jobs-kill', 'jobs-poll', 'jobs-submit']
+
+
+def run_job_command(argv, stdin_str):
+    """Run a job command line in this process.
+
+    Return (ret_code, out, err).
+    """
+    from cylc.batch_sys_manager import BatchSysManager
+    args = list(argv)
+    name = args.pop(0)
+    remote_mode = False
+    debug = False
+    while args and args[0].startswith('--'):
+        arg = args.pop(0)
+        if arg == '--':
+            break
+        elif arg == '--remote-mode':
+            remote_mode = True
+        elif arg == '--debug':
+            debug = True
+    streams = (sys.stdin, sys.stdout, sys.stderr)
+    sys.stdin = StringIO(stdin_str)
+    sys.stdout = StringIO()
+    sys.stderr = StringIO()
+    cylc.flags.debug = debug
+    try:
+        if name not in JOB_COMMANDS or not args:
+            raise ValueError('bad job command: %s' % ' '.join(argv))
+        manager = BatchSysManager()
+        if name == 'jobs-submit':
+            manager.jobs_submit(args[0], args[1:], remote_mode=remote_mode)
+        elif name == 'jobs-poll':
+            manager.jobs_poll(args[0], args[1:])
+        else:
+            manager.jobs_kill(args[0], args[1:])
+        ret_code = 0
+    except SystemExit as exc:
+        if isinstance(exc.code, int):
+            ret_code = exc.code
+        else:
+            sys.stderr.write('%s\n' % exc.code)
+            ret_code = 1
+    except Exception:
+        traceback.print_exc(file=sys.stderr)
+        ret_code = 1
+    finally:
+        out, err = sys.stdout.getvalue(), sys.stderr.getvalue()
+        sys.stdin, sys.stdout, sys.stderr = streams
+    return ret_code, out, err
+
+
+def serve(in_handle, out_handle):
+    """Serve job command requests from in_handle until end of input."""
+    while True:
+        line = in_handle.readline()
+        if not line:
+            break
+        try:
+            header = json.loads(line)
+            stdin_str = in_handle.read(header['stdin_size'])
+            argv = [str(arg) for arg in header['argv']]
+        except (KeyError, TypeError, ValueError):
+            sys.stderr.write('bad job agent request: %s' % line)
+            break
+        ret_code, out, err = run_job_command(argv, stdin_str)
+        out_handle.write(json.dumps({
+            'id': header.get('id'),
+            'ret_code': ret_code,
+            'out_size': len(out),
+            'err_size': len(err)}) + '\n')
+        out_handle.write(out)
+        out_handle.write(err)
+        out_handle.flush()
+
+
+def _set_non_blocking(fd):
+    """Set the O_NONBLOCK flag of a file descriptor."""
+    flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+    fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+
+class JobAgent(object):
+    """Run job commands for a remote user@host via a "cylc jobs-agent".
+
+    Requests are written, and responses read, without blocking. The agent
+    process is (re)started on demand, so a new one replaces one that has
+    died, e.g. because its SSH connection has dropped. Outstanding requests
+    of an agent that dies or times out fail, like commands that time out.
+    """
+
+    READ_SIZE = 65536
+
+    def __init__(self, host, owner):
+        self.host = host
+        self.owner = owner
+        self.proc = None
+        # {id: (ctx, callback, callback_args, time sent), ...}
+        self.requests = OrderedDict()
+        self.req_id = 0
+        self.write_buf = ''
+        self.read_buf = ''
+        self.err_chunks = []
+        # Results of completed requests: [(ctx, callback, callback_args), ...]
+        self.results = []
+
+    def __str__(self):
+        if self.owner:
+            return '%s@%s' % (self.owner, self.host)
+        return self.host
+
+    def get_command(self):
+        """Return the command to start the agent."""
+        cmd = ['cylc', 'jobs-agent']
+        if cylc.flags.debug:
+            cmd.append('--debug')
+        if self.host:
+            cmd.append('--host=%s' % self.host)
+        if self.owner:
+            cmd.append('--user=%s' % self.owner)
+        return cmd
+
+    def start(self):
+        """Start the agent process, if not already running."""
+        if self.proc is not None:
+            return
+        self.write_buf = ''
+        self.read_buf = ''
+        self.err_chunks = []
+        try:
+            self.proc = Popen(
+                self.get_command(), stdin=PIPE, stdout=PIPE, stderr=PIPE,
+                close_fds=True, preexec_fn=os.setpgrp)
+        except OSError as exc:
+            self.err_chunks.append(str(exc))
+            return
+        for handle in (self.proc.stdin, self.proc.stdout, self.proc.stderr):
+            _set_non_blocking(handle.fileno())
+
+    def put_command(self, ctx, callback, callback_args):
+        """Send the job command of ctx to the agent."""
+        self.start()
+        self.req_id += 1
+        argv = [
+            arg for arg in ctx.cmd[1:]
+            if not arg.startswith('--host=') and not arg.startswith('--user=')]
+        stdin_str = ctx.cmd_kwargs.get('stdin_str') or ''
+        for file_path in ctx.cmd_kwargs.get('stdin_file_paths') or []:
+            stdin_str += open(file_path).read()
+        self.requests[self.req_id] = (ctx, callback, callback_args, time())
+        self.write_buf += json.dumps({
+            'id': self.req_id,
+            'argv': argv,
+            'stdin_size': len(stdin_str)}) + '\n' + stdin_str
+        self.flush()
+
+    def flush(self):
+        """Write as much of the pending requests as possible."""
+        if self.proc is None:
+            self.fail('job agent not running')
+            return
+        while self.write_buf:
+            try:
+                n_bytes = os.write(self.proc.stdin.fileno(), self.write_buf)
+            except OSError as exc:
+                if exc.errno in (errno.EAGAIN, errno.EINTR):
+                    return
+                self.kill('job agent connection lost: %s' % exc)
+                return
+            self.write_buf = self.write_buf[n_bytes:]
+
+    def get_fds(self):
+        """Return the output file descriptors of the agent process."""
+        if self.proc is None:
+            return []
+        return [
+            handle.fileno() for handle in (self.proc.stdout, self.proc.stderr)
+            if not handle.closed]
+
+    def is_busy(self):
+        """Return True if there are outstanding requests or results."""
+        return bool(self.requests or self.results)
+
+    def read(self, fd):
+        """Read available output from fd. Handle end of file."""
+        if self.proc is None:
+            return
+        while True:
+            try:
+                data = os.read(fd, self.READ_SIZE)
+            except OSError as exc:
+                if exc.errno in (errno.EAGAIN, errno.EINTR):
+                    break
+                data = None
+            if not data:
+                if fd == self.proc.stdout.fileno():
+                    # Agent has gone away
+                    self._parse_responses()
+                    self.kill('job agent connection lost')
+                else:
+                    self.proc.stderr.close()
+                return
+            if fd == self.proc.stdout.fileno():
+                self.read_buf += data
+            else:
+                self.err_chunks.append(data)
+        self._parse_responses()
+
+    def handle_results(self, timeout=None):
+        """Return [(ctx, callback, callback_args), ...] of completed requests.
+
+        Kill the agent, if the oldest outstanding request has been waiting
+        for longer than timeout seconds.
+        """
+        if self.proc is not None:
+            self.flush()
+        if timeout and self.requests:
+            sent_time = self.requests.values()[0][3]
+            if time() > sent_time + timeout:
+                self.kill('killed on timeout (%s)' % timeout)
+        results = self.results
+        self.results = []
+        return results
+
+    def close(self):
+        """Ask the agent to exit, by closing its standard input."""
+        if self.proc is not None and not self.proc.stdin.closed:
+            self.proc.stdin.close()
+
+    def kill(self, err=None):
+        """Kill the agent process. Fail any outstanding requests with err."""
+        if self.proc is not None:
+            try:
+                os.killpg(self.proc.pid, SIGKILL)
+            except OSError:
+                pass
+            for handle in [
+                    self.proc.stdin, self.proc.stdout, self.proc.stderr]:
+                if not handle.closed:
+                    handle.close()
+            self.proc.wait()
+            self.proc = None
+        self.fail(err)
+
+    def fail(self, err=None):
+        """Fail outstanding requests with err, and agent STDERR."""
+        if self.err_chunks:
+            err = ''.join(self.err_chunks) + (err or '')
+            self.err_chunks = []
+        for ctx, callback, callback_args, _ in self.requests.values():
+            ctx.out = ''
+            ctx.err = err
+            ctx.ret_code = 1
+            ctx.timestamp = get_current_time_string()
+            self.results.append((ctx, callback, callback_args))
+        self.requests.clear()
+        self.write_buf = ''
+
+    def _parse_responses(self):
+        """Move complete responses in the read buffer to the results."""
+        while True:
+            try:
+                header_size = self.read_buf.index('\n') + 1
+                header = json.loads(self.read_buf[0:header_size])
+                out_size, err_size = header['out_size'], header['err_size']
+            except ValueError:
+                return  # incomplete header
+            except (KeyError, TypeError):
+                self.kill('bad job agent response: %s' % self.read_buf)
+                return
+            end = header_size + out_size + err_size
+            if len(self.read_buf) < end:
+                return  # incomplete payload
+            out = self.read_buf[header_size:header_size + out_size]
+            err = self.read_buf[header_size + out_size:end]
+            self.read_buf = self.read_buf[end:]
+            try:
+                ctx, callback, callback_args, _ = self.requests.pop(
+                    header['id'])
+            except KeyError:
+                continue
+            if self.err_chunks:
+                err = ''.join(self.err_chunks) + err
+                self.err_chunks = []
+            ctx.out = out
+            ctx.err = err
+            ctx.ret_code = header['ret_code']
+            ctx.timestamp = get_current_time_string()
+            self.results.append((ctx, callback, callback_args))
+
+
+class TestJobAgent(unittest.TestCase):
+    """Unit tests for the job agent request handling."""
+
+    def setUp(self):
+        self.job_log_root = os.path.join(mkdtemp(), 'log', 'job')
+        job_log_dir = os.path.join(self.job_log_root, '1', 'foo', '01')
+        os.makedirs(job_log_dir)
+        handle = open(os.path.join(job_log_dir, 'job.status'), 'wb')
+        handle.write(
+            'CYLC_BATCH_SYS_NAME=background\n' +
+            'CYLC_BATCH_SYS_JOB_ID=1\n' +
+            'CYLC_JOB_EXIT=SUCCEEDED\n')
+        handle.close()
+
+    def tearDown(self):
+        from shutil import rmtree
+        rmtree(self.job_log_root.rsplit(os.sep, 2)[0])
+
+    def test_serve(self):
+        """Test that requests are served in order with framed responses."""
+        requests = ''
+        for req_id, argv in [
+                (1, ['jobs-poll', '--', self.job_log_root, '1/foo/01']),
+                (2, ['jobs-nonsense', '--', self.job_log_root])]:
+            requests += json.dumps({
+                'id': req_id, 'argv': argv, 'stdin_size': 0}) + '\n'
+        out_handle = StringIO()
+        serve(StringIO(requests), out_handle)
+        agent = JobAgent('otherhost', None)
+
+        class Context(object):
+            """Stand in for a SuiteProcContext."""
+            out = err = ret_code = timestamp = None
+
+        ctxs = [Context(), Context()]
+        for req_id, ctx in enumerate(ctxs, 1):
+            agent.requests[req_id] = (ctx, None, [ctx], 0.0)
+        agent.read_buf = out_handle.getvalue()
+        agent._parse_responses()
+        self.assertEqual(agent.handle_results(), [
+            (ctxs[0], None, [ctxs[0]]), (ctxs[1], None, [ctxs[1]])])
+        self.assertEqual(ctxs[0].ret_code, 0)
+        self.assertTrue('[TASK JOB SUMMARY]' in ctxs[0].out)
+        self.assertTrue('|1/foo/01|background|1|' in ctxs[0].out)
+        self.assertEqual(ctxs[1].ret_code, 1)
+        self.assertTrue('bad job command' in ctxs[1].err)
+        self.assertFalse(agent.is_busy())
+
+    def test_fail(self):
+        """Test that outstanding requests fail when the agent goes away."""
+        agent = JobAgent('otherhost', 'someone')
+        self.assertEqual(str(agent), 'someone@otherhost')
+
+        class Context(object):
+            """Stand in for a SuiteProcContext."""
+            out = err = ret_code = timestamp = None
+
+        ctx = Context()
+        agent.requests[1] = (ctx, None, None, 0.0)
+        agent.err_chunks.append('ssh: connection refused\n')
+        agent.kill('job agent connection lost')
+        self.assertEqual(agent.handle_results(), [(ctx, None, None)])
+        self.assertEqual(ctx.ret_code, 1)
+        self.assertEqual(
+            ctx.err, 'ssh: connection refused\njob agent connection lost')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,19 +19,25 @@
 
 In debug mode, commands are printed to stdout before execution.
 
-Some notes:
- * To print worker process ID, call multiprocessing.current_process()
- * To use a thread pool instead of a process pool:
-   - use multiprocessing.pool.ThreadPool instead of pool.Pool
-   - use multiprocessing.dummy.current_process() for current_process()
-   - note that lsof logic may be required to ensure job scripts are
-     closed properly after writing (see jobfile.py prior to cylc-6).
-  (early versions of this module gave a choice of process or thread).
+Commands are launched directly as child processes of the suite daemon. The
+pool never blocks on a command: the standard output and error of running
+commands are read as they become available, and a command that runs for
+longer than the "process pool timeout" global setting is killed.
+
+Concurrency is limited per kind of command (command key) and per remote
+host, rather than globally, so that a slow command type or an unresponsive
+host does not hold up all other commands.
 """
 
+from collections import deque
+import errno
+import fcntl
 import logging
-import multiprocessing
+from multiprocessing import cpu_count
+import os
 from pipes import quote
+import select
+from signal import SIGKILL
 from subprocess import Popen, PIPE
 import sys
 from tempfile import TemporaryFile
@@ -40,35 +46,42 @@ import traceback
 
 from cylc.cfgspec.globalcfg import GLOBAL_CFG
 import cylc.flags
+from cylc.hostuserutil import is_remote_host
 from cylc.suite_logging import LOG
 from cylc.wallclock import get_current_time_string
 
 
-def _run_command(ctx):
-    """Execute a shell command and capture its output and exit status."""
-
-    LOG.debug(ctx)
-
-    if (SuiteProcPool.STOP_JOB_SUBMISSION.value and
-            ctx.cmd_key == SuiteProcPool.JOBS_SUBMIT):
-        ctx.err = "job submission skipped (suite stopping)"
-        ctx.ret_code = SuiteProcPool.JOB_SKIPPED_FLAG
-        ctx.timestamp = get_current_time_string()
-        return ctx
-
+def _get_stdin_file(ctx):
+    """Return a file containing the standard input of a command, or None."""
+    if ctx.cmd_kwargs.get('stdin_file_paths'):
+        stdin_file = TemporaryFile()
+        for file_path in ctx.cmd_kwargs['stdin_file_paths']:
+            for line in open(file_path):
+                stdin_file.write(line)
+        stdin_file.seek(0)
+        return stdin_file
+    elif ctx.cmd_kwargs.get('stdin_str'):
+        stdin_file = TemporaryFile()
+        stdin_file.write(ctx.cmd_kwargs['stdin_str'])
+        stdin_file.seek(0)
+        return stdin_file
+    return None
+
+
+def _popen(ctx):
+    """Launch the command of ctx. Return a Popen object.
+
+    On failure, return None and set the ret_code and err of ctx.
+    """
+    stdin_file = None
     try:
-        stdin_file = None
-        if ctx.cmd_kwargs.get('stdin_file_paths'):
-            stdin_file = TemporaryFile()
-            for file_path in ctx.cmd_kwargs['stdin_file_paths']:
-                for line in open(file_path):
-                    stdin_file.write(line)
-            stdin_file.seek(0)
-        elif ctx.cmd_kwargs.get('stdin_str'):
-            stdin_file = PIPE
-        proc = Popen(
+        stdin_file = _get_stdin_file(ctx)
+        # Run the command in its own process group, so it can be killed
+        # together with any sub-processes on timeout.
+        return Popen(
             ctx.cmd, stdin=stdin_file, stdout=PIPE, stderr=PIPE,
-            env=ctx.cmd_kwargs.get('env'), shell=ctx.cmd_kwargs.get('shell'))
+            env=ctx.cmd_kwargs.get('env'), shell=ctx.cmd_kwargs.get('shell'),
+            close_fds=True, preexec_fn=os.setpgrp)
     except IOError as exc:
         if cylc.flags.debug:
             traceback.print_exc()
@@ -81,8 +94,20 @@ def _run_command(ctx):
             traceback.print_exc()
         ctx.ret_code = 1
         ctx.err = str(exc)
-    else:
-        ctx.out, ctx.err = proc.communicate(ctx.cmd_kwargs.get('stdin_str'))
+    finally:
+        if stdin_file is not None:
+            stdin_file.close()
+    return None
+
+
+def _run_command(ctx):
+    """Execute a shell command and capture its output and exit status."""
+
+    LOG.debug(ctx)
+
+    proc = _popen(ctx)
+    if proc is not None:
+        ctx.out, ctx.err = proc.communicate()
         ctx.ret_code = proc.wait()
 
     ctx.timestamp = get_current_time_string()
@@ -137,93 +162,284 @@ class SuiteProcContext(object):
         return ret.rstrip()
 
 
+class SuiteProcRunning(object):
+    """Represent a command running in a SuiteProcPool."""
+
+    # Size of each read from the standard output and error of a command.
+    READ_SIZE = 65536
+
+    def __init__(self, ctx, callback, callback_args, limit_keys, proc,
+                 timeout):
+        self.ctx = ctx
+        self.callback = callback
+        self.callback_args = callback_args
+        self.limit_keys = limit_keys
+        self.proc = proc
+        self.timeout = timeout
+        # {file descriptor: [output chunk, ...]} of open output pipes
+        self.outputs = {}
+        self.out_chunks = []
+        self.err_chunks = []
+        for handle, chunks in [
+                (proc.stdout, self.out_chunks),
+                (proc.stderr, self.err_chunks)]:
+            fd = handle.fileno()
+            flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+            fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+            self.outputs[fd] = chunks
+
+    def get_fds(self):
+        """Return the file descriptors of the open output pipes."""
+        return self.outputs.keys()
+
+    def is_done(self):
+        """Return True if all output is read and the command has exited."""
+        return not self.outputs and self.proc.poll() is not None
+
+    def kill(self):
+        """Kill the process group of the command."""
+        try:
+            os.killpg(self.proc.pid, SIGKILL)
+        except OSError:
+            # Process group already gone
+            pass
+
+    def read(self, fd):
+        """Read available output from fd, close it on end of file."""
+        while True:
+            try:
+                data = os.read(fd, self.READ_SIZE)
+            except OSError as exc:
+                if exc.errno in (errno.EAGAIN, errno.EINTR):
+                    return
+                data = None
+            if not data:
+                break
+            self.outputs[fd].append(data)
+        self.outputs.pop(fd)
+        for handle in (self.proc.stdout, self.proc.stderr):
+            if not handle.closed and handle.fileno() == fd:
+                handle.close()
+
+    def finish(self, err=None):
+        """Close remaining output pipes and populate the command context."""
+        for fd in self.outputs.keys():
+            self.read(fd)
+        for handle in (self.proc.stdout, self.proc.stderr):
+            if not handle.closed:
+                handle.close()
+        self.outputs.clear()
+        self.ctx.out = "".join(self.out_chunks)
+        self.ctx.err = "".join(self.err_chunks)
+        if err:
+            self.ctx.err += err
+        self.ctx.ret_code = self.proc.wait()
+        self.ctx.timestamp = get_current_time_string()
+
+
 class SuiteProcPool(object):
-    """Use a process pool to execute shell commands."""
+    """Execute shell commands as non-blocking child processes.
+
+    Commands are queued by "put_command". Each call to
+    "handle_results_async" launches queued commands, up to "pool_size"
+    running commands per command key and per remote host, reads available
+    output of the running commands, kills commands that have timed out,
+    and passes the context of each completed command to its callback.
+    """
 
     JOBS_SUBMIT = "jobs-submit"
     JOB_SKIPPED_FLAG = 999
-    # Shared memory flag.
-    STOP_JOB_SUBMISSION = multiprocessing.Value('i', 0)
+    # Limit key of custom event handlers, which have tuple command keys
+    EVENT_HANDLER = "event-handler"
+    INTERVAL_JOIN = 0.1
 
-    def __init__(self, pool_size=None):
+    def __init__(self, pool_size=None, wakeup=None):
         self.pool_size = (
             pool_size or
             GLOBAL_CFG.get(["process pool size"]) or
-            multiprocessing.cpu_count())
-        # (The Pool class defaults to cpu_count anyway, but does not
-        # expose the result via its public interface).
+            cpu_count())
+        self.timeout = GLOBAL_CFG.get(["process pool timeout"])
         LOG.debug(
             "Initializing process pool, size %d" % self.pool_size)
-        self.pool = multiprocessing.Pool(processes=self.pool_size)
-        self.results = {}
+        # Queued commands: deque([(ctx, callback, callback_args), ...])
+        self.queuings = deque()
+        # Running commands: [SuiteProcRunning, ...]
+        self.runnings = []
+        # Number of running commands: {limit key: count}
+        self.n_runnings = {}
+        self.closed = False
+        self.job_submission_stopped = False
+        # Optional cylc.wakeup.MainLoopWakeUp, set when a command is queued.
+        self.wakeup = wakeup
 
     def close(self):
         """Close the pool to new commands."""
         if not (self.is_dead() or self.is_closed()):
             LOG.debug("Closing process pool")
-            self.pool.close()
+        self.closed = True
+
+    def get_fds(self):
+        """Return the output file descriptors of the running commands.
+
+        The main loop can wait on these to wake up when there are results.
+        """
+        fds = []
+        for running in self.runnings:
+            fds.extend(running.get_fds())
+        return fds
 
     def handle_results_async(self):
-        """Pass any available results to their associated callback."""
-        for key, (result, callback, callback_args) in self.results.items():
-            if result.ready():
-                self.results.pop(key)
-                value = result.get()
-                if callable(callback):
-                    if not callback_args:
-                        callback_args = []
-                    callback(value, *callback_args)
+        """Run commands and pass any available results to their callback."""
+        self._launch_commands()
+        self._read_outputs()
+        now = time.time()
+        for running in list(self.runnings):
+            if running.is_done():
+                running.finish()
+            elif self.timeout and now > running.timeout:
+                running.kill()
+                running.finish(
+                    "\nkilled on timeout (%s)" % self.timeout)
+            else:
+                continue
+            self.runnings.remove(running)
+            for key in running.limit_keys:
+                self.n_runnings[key] -= 1
+            self._run_callback(
+                running.ctx, running.callback, running.callback_args)
+        # Commands may now be launched in place of the completed ones
+        self._launch_commands()
 
     def is_closed(self):
         """Is the pool closed?"""
-        # Warning: accesses multiprocessing.Pool internal state
-        return self.pool._state == multiprocessing.pool.CLOSE
+        return self.closed
 
     def is_dead(self):
-        """Have all my workers exited yet?"""
-        # Warning: accesses multiprocessing.Pool internal state
-        for pool in self.pool._pool:
-            if pool.is_alive():
-                return False
-        return True
+        """Is the pool closed, with no queued or running commands left?"""
+        return self.closed and not self.queuings and not self.runnings
+
+    def is_not_done(self):
+        """Are there queued or running commands?"""
+        return bool(self.queuings or self.runnings)
 
     def join(self):
-        """Join after workers have exited. Close or terminate first."""
+        """Wait for running commands to exit. Close or terminate first."""
         LOG.debug("Joining process pool")
-        try:
-            self.pool.join()
-        except AssertionError:
-            # multiprocessing.Pool.join may raise this error. We want to ignore
-            # this so suite shutdown can continue.
-            pass
+        while self.runnings:
+            self.handle_results_async()
+            if self.runnings:
+                time.sleep(self.INTERVAL_JOIN)
 
     def put_command(self, ctx, callback, callback_args=None):
         """Queue a new shell command to execute."""
-        try:
-            result = self.pool.apply_async(_run_command, [ctx])
-        except AssertionError as exc:
-            LOG.warning("%s\n  %s\n %s" % (
-                str(exc),
-                "Rejecting command (pool closed)",
-                ctx.cmd))
-        else:
-            self.results[id(result)] = (result, callback, callback_args)
+        if self.closed:
+            LOG.warning("%s\n %s" % (
+                "Rejecting command (pool closed)", ctx.cmd))
+            return
+        self.queuings.append((ctx, callback, callback_args))
+        if self.wakeup is not None:
+            self.wakeup.set()
 
     @staticmethod
     def run_command(ctx):
         """Execute a shell command and capture its output and exit status."""
         return _run_command(ctx)
 
-    @classmethod
-    def stop_job_submission(cls):
-        """Set STOP_JOB_SUBMISSION flag."""
-        cls.STOP_JOB_SUBMISSION.value = 1
+    def stop_job_submission(self):
+        """Skip any job submission commands not yet launched."""
+        self.job_submission_stopped = True
 
     def terminate(self):
-        """Kill all worker processes immediately."""
+        """Kill all running commands immediately, discarding results."""
         if not self.is_dead():
             LOG.debug("Terminating process pool")
-            self.pool.terminate()
+        self.closed = True
+        self.queuings.clear()
+        for running in self.runnings:
+            running.kill()
+            running.finish()
+        self.runnings = []
+        self.n_runnings.clear()
+
+    def _get_limit_keys(self, ctx):
+        """Return the keys to limit the concurrency of a command by.
+
+        These are the command key, and the host for a remote command.
+        """
+        if isinstance(ctx.cmd_key, basestring):
+            keys = [ctx.cmd_key]
+        elif hasattr(ctx.cmd_key, 'ctx_type'):
+            keys = [ctx.cmd_key.ctx_type]
+        else:
+            keys = [self.EVENT_HANDLER]
+        host = ctx.cmd_kwargs.get('host')
+        if host is None and isinstance(ctx.cmd, list):
+            for item in ctx.cmd:
+                if item.startswith('--host='):
+                    host = item[len('--host='):]
+                    break
+        if host is None and hasattr(ctx.cmd_key, 'user_at_host'):
+            host = ctx.cmd_key.user_at_host.split('@', 1)[-1]
+            if not is_remote_host(host):
+                host = None
+        if host is not None:
+            keys.append(('host', host))
+        return keys
+
+    def _launch_commands(self):
+        """Launch queued commands, within the concurrency limits."""
+        queuings = deque()
+        while self.queuings:
+            ctx, callback, callback_args = self.queuings.popleft()
+            if self.job_submission_stopped and ctx.cmd_key == self.JOBS_SUBMIT:
+                ctx.err = "job submission skipped (suite stopping)"
+                ctx.ret_code = self.JOB_SKIPPED_FLAG
+                ctx.timestamp = get_current_time_string()
+                self._run_callback(ctx, callback, callback_args)
+                continue
+            limit_keys = self._get_limit_keys(ctx)
+            if any(self.n_runnings.get(key, 0) >= self.pool_size
+                   for key in limit_keys):
+                queuings.append((ctx, callback, callback_args))
+                continue
+            LOG.debug(ctx)
+            proc = _popen(ctx)
+            if proc is None:
+                ctx.timestamp = get_current_time_string()
+                self._run_callback(ctx, callback, callback_args)
+                continue
+            self.runnings.append(SuiteProcRunning(
+                ctx, callback, callback_args, limit_keys, proc,
+                time.time() + (self.timeout or 0)))
+            for key in limit_keys:
+                self.n_runnings.setdefault(key, 0)
+                self.n_runnings[key] += 1
+        self.queuings = queuings
+
+    def _read_outputs(self):
+        """Read any available output of the running commands."""
+        fds = {}
+        for running in self.runnings:
+            for fd in running.get_fds():
+                fds[fd] = running
+        if not fds:
+            return
+        try:
+            readables = select.select(fds.keys(), [], [], 0)[0]
+        except select.error as exc:
+            if exc.args[0] != errno.EINTR:
+                raise
+            return
+        for fd in readables:
+            fds[fd].read(fd)
+
+    @staticmethod
+    def _run_callback(ctx, callback, callback_args):
+        """Pass the context of a completed command to its callback."""
+        if callable(callback):
+            if not callback_args:
+                callback_args = []
+            callback(ctx, *callback_args)
 
 
 def main():
@@ -128,10 +128,18 @@ class SuiteRuntimeServiceClient(object):
         kwargs['method'] = self.METHOD_GET
         return self._call_server_func(command, *args, **kwargs)
 
-    def get_latest_state(self, full_mode):
-        """Return latest state of the suite (for the GUI)."""
+    def get_latest_state(self, full_mode, summary_seq_num=None):
+        """Return latest state of the suite (for the GUI).
+
+        If summary_seq_num is set, only request changes to the state summary
+        since that sequence number.
+        """
+        kwargs = {}
+        if summary_seq_num is not None:
+            kwargs['summary_seq_num'] = summary_seq_num
         return self._call_server_func(
-            'get_latest_state', method=self.METHOD_GET, full_mode=full_mode)
+            'get_latest_state', method=self.METHOD_GET, full_mode=full_mode,
+            **kwargs)
 
     def get_suite_state_summary(self):
         """Return the global, task, and family summary data structures."""
@@ -169,6 +177,14 @@ class SuiteRuntimeServiceClient(object):
         return self._call_server_func(
             'put_message', task_id=task_id, priority=priority, message=message)
 
+    def put_messages(self, messages):
+        """Send a batch of task messages in a single request.
+
+        messages is a list of (task_id, priority, message, event_time).
+        """
+        return self._call_server_func(
+            'put_messages', payload={'messages': messages})
+
     def reset(self, *args, **kwargs):
         """Compat method, does nothing."""
         pass
@@ -298,11 +298,14 @@ class SuiteRuntimeService(object):
 
     @cherrypy.expose
     @cherrypy.tools.json_out()
-    def get_latest_state(self, full_mode=False):
+    def get_latest_state(self, full_mode=False, summary_seq_num=None):
         """Return latest suite state (suitable for a GUI update)."""
         client_info = self._check_access_priv_and_report(PRIV_FULL_READ)
         full_mode = self._literal_eval('full_mode', full_mode)
-        return self.schd.info_get_latest_state(client_info, full_mode)
+        summary_seq_num = self._literal_eval(
+            'summary_seq_num', summary_seq_num)
+        return self.schd.info_get_latest_state(
+            client_info, full_mode, summary_seq_num)
 
     @cherrypy.expose
     @cherrypy.tools.json_out()
@@ -488,10 +491,32 @@ class SuiteRuntimeService(object):
     @cherrypy.expose
     @cherrypy.tools.json_out()
     def put_message(self, task_id, priority, message):
+        """Queue a task message."""
         self._check_access_priv_and_report(PRIV_FULL_CONTROL, log_info=False)
-        self.schd.message_queue.put((task_id, priority, str(message)))
+        self.schd.message_queue.put([(task_id, priority, str(message))])
         return (True, 'Message queued')
 
+    @cherrypy.expose
+    @cherrypy.tools.json_in()
+    @cherrypy.tools.json_out()
+    def put_messages(self, messages=None):
+        """Queue a batch of task messages.
+
+        messages is a list of (task_id, priority, message, event_time). If
+        event_time is set, it is appended to the message as " at TIME".
+        """
+        self._check_access_priv_and_report(PRIV_FULL_CONTROL, log_info=False)
+        messages = utf8_enforce(
+            cherrypy.request.json.get("messages", messages)) or []
+        batch = []
+        for task_id, priority, message, event_time in messages:
+            if event_time:
+                message += ' at %s' % event_time
+            batch.append((task_id, priority, message))
+        if batch:
+            self.schd.message_queue.put(batch)
+        return (True, '%d message(s) queued' % len(batch))
+
     @cherrypy.expose
     @cherrypy.tools.json_out()
     def reload_suite(self):
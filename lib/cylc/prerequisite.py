@@ -37,14 +37,19 @@ class Prerequisite(object):
     """The concrete result of an abstract logical trigger expression."""
 
     # Memory optimization - constrain possible attributes to this list.
-    __slots__ = ["SATISFIED_TEMPLATE", "MESSAGE_TEMPLATE",
+    __slots__ = ["MESSAGE_TEMPLATE", "LEAF_TEMPLATE", "COMPILED_CONDITIONS",
                  "satisfied", "_all_satisfied",
                  "target_point_strings", "start_point",
-                 "pre_initial_messages", "conditional_expression", "point"]
+                 "pre_initial_messages", "conditional_expression",
+                 "_conditional_keys", "_conditional_func", "point"]
 
-    # Extracts T from "foo.T succeeded" etc.
-    SATISFIED_TEMPLATE = 'bool(self.satisfied[("%s", "%s", "%s")])'
     MESSAGE_TEMPLATE = '%s.%s %s'
+    # Leaf of a compiled condition, i.e. "foo.T succeeded" => "s[N]".
+    LEAF_TEMPLATE = 's[%d]'
+
+    # Compiled conditions, shared by all prerequisites with the same logic:
+    # {'(s[0]|s[1])&s[2]': <function>, ...}
+    COMPILED_CONDITIONS = {}
 
     DEP_STATE_SATISFIED = 'satisfied naturally'
     DEP_STATE_OVERRIDDEN = 'force satisfied'
@@ -74,6 +79,11 @@ class Prerequisite(object):
         # 'foo.1 failed & bar.1 succeeded'
         self.conditional_expression = None
 
+        # Messages in the order of the leaves of the compiled condition, and
+        # the compiled condition itself (None until first evaluation).
+        self._conditional_keys = None
+        self._conditional_func = None
+
         # The cashed state of this prerequisite:
         # * `None` (no cached state)
         # * `True` (prereuisite satisfied)
@@ -108,13 +118,9 @@ class Prerequisite(object):
         Returns None if this prerequisite is not a conditional one.
 
         """
-        expr = self.conditional_expression
-        if not expr:
+        if not self.conditional_expression:
             return None
-        for message in self.satisfied:
-            expr = expr.replace(self.SATISFIED_TEMPLATE % message,
-                                self.MESSAGE_TEMPLATE % message)
-        return expr
+        return self.conditional_expression
 
     def set_condition(self, expr):
         """Set the conditional expression for this prerequisite.
@@ -125,6 +131,8 @@ class Prerequisite(object):
 
         drop_these = []
         self._all_satisfied = None
+        self._conditional_keys = None
+        self._conditional_func = None
 
         if self.pre_initial_messages:
             for message in self.pre_initial_messages:
@@ -150,10 +158,6 @@ class Prerequisite(object):
                 simpler = ConditionalSimplifier(
                     expr, [self.MESSAGE_TEMPLATE % m for m in drop_these])
                 expr = simpler.get_cleaned()
-            # Make a Python expression so we can eval() the logic.
-            for message in self.satisfied:
-                expr = expr.replace(self.MESSAGE_TEMPLATE % message,
-                                    self.SATISFIED_TEMPLATE % message)
             self.conditional_expression = expr
 
     def is_satisfied(self):
@@ -170,7 +174,7 @@ class Prerequisite(object):
                 # No prerequisites left after pre-initial simplification.
                 return True
             if self.conditional_expression:
-                # Trigger expression with at least one '|': use eval.
+                # Trigger expression with at least one '|'.
                 self._all_satisfied = self._conditional_is_satisfied()
             else:
                 self._all_satisfied = all(self.satisfied.values())
@@ -182,17 +186,49 @@ class Prerequisite(object):
         Does not cache the result.
 
         """
+        if self._conditional_func is None:
+            self._compile_condition()
+        return bool(self._conditional_func(
+            [self.satisfied[key] for key in self._conditional_keys]))
+
+    def _compile_condition(self):
+        """Compile the condition expression into a function.
+
+        The messages in the expression are replaced by leaves "s[N]", so that
+        prerequisites with the same logic (e.g. those of the same task at
+        different cycle points) share the same compiled function, which is
+        evaluated with the list of message states in leaf order.
+
+        """
+        expr = self.conditional_expression
+        # Number leaves in order of appearance in the expression.
+        keys = sorted(
+            self.satisfied,
+            key=lambda key: expr.find(self.MESSAGE_TEMPLATE % key))
+        # Replace longer messages first, in case one message contains another.
+        for i, key in sorted(
+                enumerate(keys),
+                key=lambda item: -len(self.MESSAGE_TEMPLATE % item[1])):
+            expr = expr.replace(
+                self.MESSAGE_TEMPLATE % key, self.LEAF_TEMPLATE % i)
         try:
-            res = eval(self.conditional_expression)
-        except Exception, exc:
-            err_msg = str(exc)
-            if str(exc).find("unexpected EOF") != -1:
-                err_msg += ("\n(?could be unmatched parentheses in the graph "
-                            "string?)")
-            ERR.error(err_msg)
-            raise TriggerExpressionError(
-                '"%s"' % self.get_raw_conditional_expression())
-        return res
+            func = self.COMPILED_CONDITIONS[expr]
+        except KeyError:
+            try:
+                func = eval('lambda s: %s' % (
+                    expr.replace('&', ' and ').replace('|', ' or ')))
+                func([False] * len(keys))
+            except Exception, exc:
+                err_msg = str(exc)
+                if str(exc).find("unexpected EOF") != -1:
+                    err_msg += ("\n(?could be unmatched parentheses in the "
+                                "graph string?)")
+                ERR.error(err_msg)
+                raise TriggerExpressionError(
+                    '"%s"' % self.get_raw_conditional_expression())
+            self.COMPILED_CONDITIONS[expr] = func
+        self._conditional_keys = keys
+        self._conditional_func = func
 
     def satisfy_me(self, all_task_outputs):
         """Evaluate pre-requisite against known outputs.
@@ -201,8 +237,13 @@ class Prerequisite(object):
 
         """
         relevant_messages = all_task_outputs & set(self.satisfied)
+        if not relevant_messages:
+            return relevant_messages
         for message in relevant_messages:
             self.satisfied[message] = self.DEP_STATE_SATISFIED
+        # No need to re-evaluate if already satisfied: satisfying more
+        # messages cannot unsatisfy an "&"/"|" expression.
+        if not self._all_satisfied:
             if self.conditional_expression is None:
                 self._all_satisfied = all(self.satisfied.values())
             else:
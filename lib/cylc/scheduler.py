@@ -20,7 +20,7 @@
 from collections import deque
 from logging import DEBUG
 import os
-from Queue import Empty, Queue
+from Queue import Empty
 from shutil import copytree, rmtree
 from subprocess import Popen, PIPE
 import sys
@@ -61,6 +61,7 @@ from cylc.task_proxy import TaskProxy, TaskProxySequenceBoundsError
 from cylc.task_state import TASK_STATUSES_ACTIVE, TASK_STATUS_FAILED
 from cylc.templatevars import load_template_vars
 from cylc.version import CYLC_VERSION
+from cylc.wakeup import MainLoopWakeUp, WakeUpQueue
 from cylc.wallclock import (
     get_current_time_string, get_seconds_as_interval_string)
 from cylc.profiler import Profiler
@@ -161,6 +162,7 @@ class Scheduler(object):
         self.state_summary_mgr = None
         self.pool = None
         self.proc_pool = None
+        self.wakeup = None
         self.task_job_mgr = None
         self.task_events_mgr = None
         self.suite_event_handler = None
@@ -220,7 +222,8 @@ class Scheduler(object):
             # Setup the suite log.
             SuiteLog.get_inst(self.suite).pimp(detach)
 
-            self.proc_pool = SuiteProcPool()
+            self.wakeup = MainLoopWakeUp()
+            self.proc_pool = SuiteProcPool(wakeup=self.wakeup)
             self.configure_comms_daemon()
             self.configure()
             self.profiler.start()
@@ -297,9 +300,9 @@ conditions; see `cylc conditions`.
         # Start up essential services
         self.suite_log = SuiteLog.get_inst(self.suite)
         self.state_summary_mgr = StateSummaryMgr()
-        self.command_queue = Queue()
-        self.message_queue = Queue()
-        self.ext_trigger_queue = Queue()
+        self.command_queue = WakeUpQueue(self.wakeup)
+        self.message_queue = WakeUpQueue(self.wakeup)
+        self.ext_trigger_queue = WakeUpQueue(self.wakeup)
         self.suite_event_handler = SuiteEventHandler(self.proc_pool)
         self.task_job_mgr = TaskJobManager(
             self.suite, self.proc_pool, self.suite_db_mgr,
@@ -512,17 +515,23 @@ conditions; see `cylc conditions`.
             return
 
     def process_queued_task_messages(self):
-        """Handle incoming task messages for each task proxy."""
+        """Handle incoming task messages for each task proxy.
+
+        Each item in the message queue is a batch (list) of
+        (task_id, priority, message) tuples.
+        """
         task_id_messages = {}
         while self.message_queue.qsize():
             try:
-                task_id, priority, message = self.message_queue.get(
-                    block=False)
+                messages = self.message_queue.get(block=False)
             except Empty:
                 break
             self.message_queue.task_done()
-            task_id_messages.setdefault(task_id, [])
-            task_id_messages[task_id].append((priority, message))
+            for task_id, priority, message in messages:
+                task_id_messages.setdefault(task_id, [])
+                task_id_messages[task_id].append((priority, message))
+        if not task_id_messages:
+            return
         for itask in self.pool.get_tasks():
             if itask.identity in task_id_messages:
                 for priority, message in task_id_messages[itask.identity]:
@@ -631,22 +640,34 @@ conditions; see `cylc conditions`.
                 results[name] = {}
         return results
 
-    def info_get_latest_state(self, client_info, full_mode):
+    def info_get_latest_state(self, client_info, full_mode,
+                              summary_seq_num=None):
         """Return latest suite state (suitable for a GUI update).
 
         If previous update time is set, return only information since previous
         update time. Otherwise, return full information required to populate
         the GUI tree and LED views.
 
+        If the client sends the sequence number of the last state summary it
+        has seen, return only the changes to the state summary since then,
+        or the full state summary if the client is too far behind.
+
         Args:
             client_info (dict): store 'prev_time', 'prev_err_size'.
             full_mode (bool): force full update
+            summary_seq_num (int): sequence number of client's state summary
 
         Return:
             (dict):
                 cylc_version (str): version of cylc running this suite
                 full_mode (bool): is this returning a full update?
                 summary (tuple): (global_summary, task_summary, family_summary)
+                summary_delta (tuple):
+                    (global_summary, task_summary, family_summary,
+                     removed_task_ids, removed_family_ids), changes since
+                    summary_seq_num, where task_summary and family_summary
+                    only contain the changed entries
+                summary_seq_num (int): sequence number of state summary
                 ancestors (dict): first parent ancestors
                 ancestors_pruned (dict):
                     first parent ancestors, without non-task namespaces
@@ -670,10 +691,18 @@ conditions; see `cylc conditions`.
         if prev_time is None:
             full_mode = True
             ret['full_mode'] = True
-        if full_mode or (
+        if full_mode:
+            summary_seq_num = None
+        if summary_seq_num is not None or full_mode or (
                 self.state_summary_mgr.update_time and
                 prev_time < self.state_summary_mgr.update_time):
-            ret['summary'] = self.state_summary_mgr.get_state_summary()
+            ret['summary_seq_num'], summary, delta = (
+                self.state_summary_mgr.get_state_summary_update(
+                    summary_seq_num))
+            if summary is not None:
+                ret['summary'] = summary
+            elif delta is not None:
+                ret['summary_delta'] = delta
         if full_mode or (
                 self.suiterc_update_time and
                 prev_time < self.suiterc_update_time):
@@ -1370,10 +1399,28 @@ conditions; see `cylc conditions`.
             if self.options.profile_mode:
                 self.update_profiler_logs(tinit)
 
-            sleep(self.INTERVAL_MAIN_LOOP)
+            self.wait_for_work()
             self.main_loop_intervals.append(time() - tinit)
             # END MAIN LOOP
 
+    def wait_for_work(self):
+        """Block until there is work to do, or for INTERVAL_MAIN_LOOP.
+
+        Incoming commands, task messages, external triggers, newly queued
+        process pool commands and output from running process pool commands
+        wake up the main loop immediately. Do not block at all
+        if the last iteration left work for the next one, e.g. task messages
+        that changed task states. Do not block beyond the next task timer
+        deadline.
+        """
+        if self.task_events_mgr.pflag or self.pool.do_reload:
+            return
+        timeout = self.INTERVAL_MAIN_LOOP
+        deadline = self.pool.get_next_timer_deadline()
+        if deadline is not None:
+            timeout = max(0.0, min(timeout, deadline - time()))
+        self.wakeup.wait(timeout, self.proc_pool.get_fds())
+
     def update_state_summary(self):
         """Update state summary, e.g. for GUI."""
         self.state_summary_mgr.update(self)
@@ -1452,8 +1499,7 @@ conditions; see `cylc conditions`.
             process = True
             self.task_events_mgr.pflag = False  # reset
 
-        self.pool.set_expired_tasks()
-        if self.pool.waiting_tasks_ready():
+        if self.pool.check_wait_timers():
             process = True
 
         if self.run_mode == 'simulation' and self.pool.sim_time_check(
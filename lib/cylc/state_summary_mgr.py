@@ -31,9 +31,21 @@ from cylc.task_state_prop import extract_group_state
 
 
 class StateSummaryMgr(object):
-    """Manage suite state summary for client, e.g. GUI."""
+    """Manage suite state summary for client, e.g. GUI.
+
+    The summary is updated incrementally. Only tasks that are new, that have
+    left the pool, that have moved out of the runahead pool, or that have
+    marked themselves as updated (TaskState.is_updated) are re-summarised.
+    Family states and state counts are only recomputed for the cycle points
+    of these tasks.
+
+    Each update is numbered, and the IDs of the tasks and families changed by
+    the last MAX_LEN_CHANGE_LOG updates are logged, so that clients can ask
+    for the changes since the last update they have seen.
+    """
 
     TIME_FIELDS = ['submitted_time', 'started_time', 'finished_time']
+    MAX_LEN_CHANGE_LOG = 100
 
     def __init__(self):
         self.task_summary = {}
@@ -42,25 +54,61 @@ class StateSummaryMgr(object):
         self.update_time = None
         self.state_count_totals = {}
         self.state_count_cycles = {}
+        # [(seq_num, set([task_id, ...]), set([family_id, ...])), ...]
+        self.change_log = []
+        self.seq_num = 0
+        # Suite configuration the summary was built against.
+        self._config = None
+        # Task proxies in the last summary, and which of them were runahead.
+        self._itasks = {}
+        self._runahead_ids = set()
+        # {point_string: {name: state}}
+        self._task_states = {}
+        # {point_string: set([family_id, ...])}
+        self._point_fam_ids = {}
+        # {name: tuple(elapsed_times)}, for mean elapsed times.
+        self._elapsed_times = {}
 
     def update(self, schd):
         """Update."""
         self.update_time = time()
+        if schd.config is not self._config:
+            # Start (or restart on reload) with an empty summary.
+            self._config = schd.config
+            self._itasks.clear()
+            self._runahead_ids.clear()
+            self._task_states.clear()
+            self._point_fam_ids.clear()
+            self._elapsed_times.clear()
+            self.task_summary = {}
+            self.family_summary = {}
+            self.state_count_cycles = {}
+            # Leave a gap in the sequence, so clients get a full update.
+            self.change_log = []
+            self.seq_num += 1
+
+        # Modify copies, so that the originals can be replaced atomically.
         global_summary = {}
-        family_summary = {}
-
-        task_summary, task_states = self._get_tasks_info(schd)
+        task_summary = dict(self.task_summary)
+        family_summary = dict(self.family_summary)
+        state_count_cycles = dict(self.state_count_cycles)
 
-        all_states = []
         ancestors_dict = schd.config.get_first_parent_ancestors()
-
-        # Compute state_counts (total, and per cycle).
-        state_count_totals = {}
-        state_count_cycles = {}
-
-        for point_string, c_task_states in task_states.items():
-            # For each cycle point, construct a family state tree
+        changed_task_ids, changed_points = self._update_tasks_info(
+            schd, task_summary)
+        changed_fam_ids = set()
+        for point_string in changed_points:
+            # For each changed cycle point, reconstruct the family state tree
             # based on the first-parent single-inheritance tree
+            old_fam_summary = {}
+            for f_id in self._point_fam_ids.pop(point_string, []):
+                old_fam_summary[f_id] = family_summary.pop(f_id, None)
+            changed_fam_ids.update(old_fam_summary)
+            c_task_states = self._task_states.get(point_string)
+            if not c_task_states:
+                self._task_states.pop(point_string, None)
+                state_count_cycles.pop(point_string, None)
+                continue
 
             c_fam_task_states = {}
 
@@ -75,7 +123,6 @@ class StateSummaryMgr(object):
                 except KeyError:
                     count[state] = 1
 
-                all_states.append(state)
                 for parent in ancestors_dict.get(key, []):
                     if parent == key:
                         continue
@@ -84,6 +131,7 @@ class StateSummaryMgr(object):
 
             state_count_cycles[point_string] = count
 
+            f_ids = set()
             for fam, child_states in c_fam_task_states.items():
                 f_id = TaskID.get(fam, point_string)
                 state = extract_group_state(child_states)
@@ -100,6 +148,12 @@ class StateSummaryMgr(object):
                                         'title': title,
                                         'label': point_string,
                                         'state': state}
+                f_ids.add(f_id)
+                if old_fam_summary.get(f_id) == family_summary[f_id]:
+                    changed_fam_ids.discard(f_id)
+                else:
+                    changed_fam_ids.add(f_id)
+            self._point_fam_ids[point_string] = f_ids
 
         state_count_totals = {}
         for point_string, count in state_count_cycles.items():
@@ -107,7 +161,9 @@ class StateSummaryMgr(object):
                 state_count_totals.setdefault(state, 0)
                 state_count_totals[state] += state_count
 
-        all_states.sort()
+        all_states = []
+        for state, state_count in sorted(state_count_totals.items()):
+            all_states.extend([state] * state_count)
 
         for key, value in (
                 ('oldest cycle point string', schd.pool.get_min_point()),
@@ -159,35 +215,124 @@ class StateSummaryMgr(object):
         self.family_summary = family_summary
         self.state_count_totals = state_count_totals
         self.state_count_cycles = state_count_cycles
-
-    @staticmethod
-    def _get_tasks_info(schd):
-        """Retrieve task summary info and states."""
-
-        task_summary = {}
-        task_states = {}
-
-        for task in schd.pool.get_tasks():
-            ts = task.get_state_summary()
-            task_summary[task.identity] = ts
-            name, point_string = TaskID.split(task.identity)
-            task_states.setdefault(point_string, {})
-            task_states[point_string][name] = ts['state']
-
-        for task in schd.pool.get_rh_tasks():
-            ts = task.get_state_summary()
-            ts['state'] = TASK_STATUS_RUNAHEAD
-            task_summary[task.identity] = ts
-            name, point_string = TaskID.split(task.identity)
-            task_states.setdefault(point_string, {})
-            task_states[point_string][name] = ts['state']
-
-        return task_summary, task_states
+        # Log changes after the summaries are replaced, so a client reading
+        # the log then the summaries never gets a summary older than the log.
+        self.seq_num += 1
+        self.change_log = self.change_log[1 - self.MAX_LEN_CHANGE_LOG:] + [
+            (self.seq_num, changed_task_ids, changed_fam_ids)]
+
+    def _update_tasks_info(self, schd, task_summary):
+        """Update task summary info and states of changed tasks.
+
+        Return a set of the IDs of changed (and removed) tasks, and a set of
+        their cycle points.
+        """
+        # Task definitions with new elapsed times need new mean elapsed times.
+        changed_names = set()
+        for name, tdef in schd.config.taskdefs.items():
+            elapsed_times = tuple(tdef.elapsed_times)
+            if self._elapsed_times.get(name) != elapsed_times:
+                self._elapsed_times[name] = elapsed_times
+                changed_names.add(name)
+
+        changed_task_ids = set()
+        changed_points = set()
+        itasks = {}
+        runahead_ids = set()
+        for is_runahead, tasks in [
+                (False, schd.pool.get_tasks()),
+                (True, schd.pool.get_rh_tasks())]:
+            for itask in tasks:
+                itasks[itask.identity] = itask
+                if is_runahead:
+                    runahead_ids.add(itask.identity)
+                if not (
+                        itask.state.is_updated or
+                        self._itasks.get(itask.identity) is not itask or
+                        (itask.identity in self._runahead_ids) !=
+                        is_runahead or
+                        itask.tdef.name in changed_names or
+                        itask.summary.get('spawned') !=
+                        str(itask.has_spawned)):
+                    continue
+                itask.state.is_updated = False
+                ts = itask.get_state_summary()
+                if is_runahead:
+                    ts['state'] = TASK_STATUS_RUNAHEAD
+                task_summary[itask.identity] = ts
+                name, point_string = TaskID.split(itask.identity)
+                self._task_states.setdefault(point_string, {})
+                self._task_states[point_string][name] = ts['state']
+                changed_task_ids.add(itask.identity)
+                changed_points.add(point_string)
+
+        for task_id in set(self._itasks) - set(itasks):
+            # Task no longer in the pool.
+            task_summary.pop(task_id, None)
+            name, point_string = TaskID.split(task_id)
+            self._task_states.get(point_string, {}).pop(name, None)
+            changed_task_ids.add(task_id)
+            changed_points.add(point_string)
+
+        self._itasks = itasks
+        self._runahead_ids = runahead_ids
+        return changed_task_ids, changed_points
 
     def get_state_summary(self):
         """Return the global, task, and family summary data structures."""
         return (self.global_summary, self.task_summary, self.family_summary)
 
+    def get_state_summary_update(self, seq_num=None):
+        """Return the state summary, or the changes to it since seq_num.
+
+        Return (seq_num, summary, delta), where seq_num is the number of the
+        latest update, and either:
+        * summary is (global_summary, task_summary, family_summary), the
+          full summary, and delta is None, if seq_num is None or too old.
+        * summary is None, and delta is (global_summary, task_summary,
+          family_summary, removed_task_ids, removed_family_ids), where
+          task_summary and family_summary only contain the entries changed
+          since seq_num.
+        * summary and delta are None, if seq_num is the latest update.
+        """
+        # Read the log before the summaries, see "update".
+        change_log = self.change_log
+        global_summary, task_summary, family_summary = (
+            self.get_state_summary())
+        if not change_log:
+            return (self.seq_num, (global_summary, task_summary,
+                                   family_summary), None)
+        latest_seq_num = change_log[-1][0]
+        if seq_num == latest_seq_num:
+            return (latest_seq_num, None, None)
+        if (seq_num is None or seq_num < change_log[0][0] - 1 or
+                seq_num > latest_seq_num):
+            return (latest_seq_num, (global_summary, task_summary,
+                                     family_summary), None)
+        task_ids = set()
+        fam_ids = set()
+        for entry_seq_num, entry_task_ids, entry_fam_ids in change_log:
+            if entry_seq_num > seq_num:
+                task_ids.update(entry_task_ids)
+                fam_ids.update(entry_fam_ids)
+        task_changes = {}
+        task_removals = []
+        for task_id in task_ids:
+            try:
+                task_changes[task_id] = task_summary[task_id]
+            except KeyError:
+                task_removals.append(task_id)
+        fam_changes = {}
+        fam_removals = []
+        for fam_id in fam_ids:
+            try:
+                fam_changes[fam_id] = family_summary[fam_id]
+            except KeyError:
+                fam_removals.append(fam_id)
+        return (latest_seq_num, None, (
+            global_summary, task_changes, fam_changes, task_removals,
+            fam_removals))
+
     def get_state_totals(self):
         """Return dict of count per state and dict of state count per cycle."""
         return (self.state_count_totals, self.state_count_cycles)
@@ -219,3 +364,22 @@ class StateSummaryMgr(object):
                     (None, len(ret[state]) - 5, None,)]
 
         return ret
+
+
+def apply_state_summary_delta(task_summary, family_summary, delta):
+    """Apply a delta from StateSummaryMgr.get_state_summary_update.
+
+    Return the new (global_summary, task_summary, family_summary), leaving
+    the original task_summary and family_summary dicts unchanged.
+    """
+    global_summary, task_changes, fam_changes, task_removals, fam_removals = (
+        delta)
+    task_summary = dict(task_summary)
+    task_summary.update(task_changes)
+    for task_id in task_removals:
+        task_summary.pop(task_id, None)
+    family_summary = dict(family_summary)
+    family_summary.update(fam_changes)
+    for fam_id in fam_removals:
+        family_summary.pop(fam_id, None)
+    return global_summary, task_summary, family_summary
@@ -81,6 +81,9 @@ class SuiteDatabaseManager(object):
             self.TABLE_TASK_OUTPUTS: [],
             self.TABLE_TASK_TIMEOUT_TIMERS: []}
         self.db_updates_map = {}
+        # Rows of tables that mirror the task pool, as last written:
+        # {table_name: {source: {(cycle, name[, ctx_key]): signature}}}
+        self.db_rows_cache = {}
 
     def checkpoint(self, name):
         """Checkpoint the task pool, etc."""
@@ -270,58 +273,46 @@ class SuiteDatabaseManager(object):
                 {"key": key, "value": value})
 
     def put_task_event_timers(self, task_events_mgr):
-        """Put statements to update the task_action_timers table."""
-        if task_events_mgr.event_timers:
-            self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
-            for key, timer in task_events_mgr.event_timers.items():
-                key1, point, name, submit_num = key
-                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
-                    "name": name,
-                    "cycle": point,
-                    "ctx_key_pickle": pickle.dumps((key1, submit_num,)),
-                    "ctx_pickle": pickle.dumps(timer.ctx),
-                    "delays_pickle": pickle.dumps(timer.delays),
-                    "num": timer.num,
-                    "delay": timer.delay,
-                    "timeout": timer.timeout})
+        """Put statements to update the task_action_timers table.
+
+        Only write the event timers that have been added, changed or removed
+        since the last call.
+        """
+        rows = {}
+        for key, timer in task_events_mgr.event_timers.items():
+            key1, point, name, submit_num = key
+            rows[(point, name, (key1, submit_num))] = (
+                self._get_task_action_timer_signature(timer), timer)
+        self._put_rows_diff(
+            self.TABLE_TASK_ACTION_TIMERS, "event_timers", rows,
+            self._get_task_action_timer_args)
 
     def put_task_pool(self, pool):
         """Put statements to update the task_pool table in runtime database.
 
-        Update the task_pool table and the task_action_timers table.
-        Queue delete (everything) statements to wipe the tables, and queue the
-        relevant insert statements for the current tasks in the pool.
+        Update the task_pool, task_timeout_timers and task_action_timers
+        tables. Only write the rows of task proxies that have been added,
+        changed or removed since the last call. (Wipe the tables on the first
+        call.)
         """
-        self.db_deletes_map[self.TABLE_TASK_POOL].append({})
-        # No need to do:
-        # self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
-        # Should already be done by self.put_task_event_timers above.
-        self.db_deletes_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({})
+        pool_rows = {}
+        timeout_rows = {}
+        timer_rows = {}
         for itask in pool.get_all_tasks():
-            self.db_inserts_map[self.TABLE_TASK_POOL].append({
-                "name": itask.tdef.name,
-                "cycle": str(itask.point),
-                "spawned": int(itask.has_spawned),
-                "status": itask.state.status,
-                "hold_swap": itask.state.hold_swap})
+            point = str(itask.point)
+            name = itask.tdef.name
+            pool_rows[(point, name)] = (
+                (int(itask.has_spawned), itask.state.status,
+                 itask.state.hold_swap), None)
             if itask.state.status in itask.timeout_timers:
-                self.db_inserts_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "timeout": itask.timeout_timers[itask.state.status]})
+                timeout = itask.timeout_timers[itask.state.status]
+                timeout_rows[(point, name)] = (timeout, None)
             for ctx_key_0 in ["poll_timers", "try_timers"]:
                 for ctx_key_1, timer in getattr(itask, ctx_key_0).items():
                     if timer is None:
                         continue
-                    self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
-                        "name": itask.tdef.name,
-                        "cycle": str(itask.point),
-                        "ctx_key_pickle": pickle.dumps((ctx_key_0, ctx_key_1)),
-                        "ctx_pickle": pickle.dumps(timer.ctx),
-                        "delays_pickle": pickle.dumps(timer.delays),
-                        "num": timer.num,
-                        "delay": timer.delay,
-                        "timeout": timer.timeout})
+                    timer_rows[(point, name, (ctx_key_0, ctx_key_1))] = (
+                        self._get_task_action_timer_signature(timer), timer)
             if itask.state.time_updated:
                 set_args = {
                     "time_updated": itask.state.time_updated,
@@ -337,12 +328,85 @@ class SuiteDatabaseManager(object):
                     (set_args, where_args))
                 itask.state.time_updated = None
 
+        self._put_rows_diff(
+            self.TABLE_TASK_POOL, "task_pool", pool_rows,
+            lambda key, signature, _: {
+                "cycle": key[0],
+                "name": key[1],
+                "spawned": signature[0],
+                "status": signature[1],
+                "hold_swap": signature[2]})
+        self._put_rows_diff(
+            self.TABLE_TASK_TIMEOUT_TIMERS, "task_pool", timeout_rows,
+            lambda key, signature, _: {
+                "cycle": key[0],
+                "name": key[1],
+                "timeout": signature})
+        self._put_rows_diff(
+            self.TABLE_TASK_ACTION_TIMERS, "task_pool", timer_rows,
+            self._get_task_action_timer_args)
+
         self.db_inserts_map[self.TABLE_CHECKPOINT_ID].append({
             # id = -1 for latest
             "id": CylcSuiteDAO.CHECKPOINT_LATEST_ID,
             "time": get_current_time_string(),
             "event": CylcSuiteDAO.CHECKPOINT_LATEST_EVENT})
 
+    @staticmethod
+    def _get_task_action_timer_signature(timer):
+        """Return a comparable snapshot of the state of a TaskActionTimer."""
+        return (timer.ctx, list(timer.delays), timer.num, timer.delay,
+                timer.timeout)
+
+    @staticmethod
+    def _get_task_action_timer_args(key, _, timer):
+        """Return insert args for a task_action_timers row."""
+        point, name, ctx_key = key
+        return {
+            "name": name,
+            "cycle": point,
+            "ctx_key_pickle": pickle.dumps(ctx_key),
+            "ctx_pickle": pickle.dumps(timer.ctx),
+            "delays_pickle": pickle.dumps(timer.delays),
+            "num": timer.num,
+            "delay": timer.delay,
+            "timeout": timer.timeout}
+
+    def _put_rows_diff(self, table_name, source, rows, get_args):
+        """Put statements to bring rows in table_name up to date.
+
+        rows is a dict {key: (signature, obj)}, where key is (cycle, name) or
+        (cycle, name, ctx_key). A row is inserted (or replaced) if its key is
+        new or its signature has changed since the last call for the same
+        source, and is deleted if its key is gone. get_args(key, signature,
+        obj) returns the insert args of a row.
+
+        On the first call for a table, wipe the table, in case it has rows
+        from a previous run.
+        """
+        if table_name not in self.db_rows_cache:
+            self.db_rows_cache[table_name] = {}
+            self.db_deletes_map[table_name].append({})
+        old_rows = self.db_rows_cache[table_name].get(source, {})
+        new_rows = {}
+        for key, (signature, obj) in rows.items():
+            new_rows[key] = signature
+            if key not in old_rows or old_rows[key] != signature:
+                self.db_inserts_map[table_name].append(
+                    get_args(key, signature, obj))
+        for key in set(old_rows) - set(new_rows):
+            where_args = {"cycle": key[0], "name": key[1]}
+            if len(key) > 2:
+                where_args["ctx_key_pickle"] = pickle.dumps(key[2])
+            self.db_deletes_map[table_name].append(where_args)
+            # Delete statements are executed before insert statements, so
+            # clear out any queued insert of the deleted row.
+            self.db_inserts_map[table_name] = [
+                args for args in self.db_inserts_map[table_name]
+                if any(args.get(arg_key) != value
+                       for arg_key, value in where_args.items())]
+        self.db_rows_cache[table_name][source] = new_rows
+
     def put_insert_task_events(self, itask, args):
         """Put INSERT statement for task_events table."""
         self._put_insert_task_x(CylcSuiteDAO.TABLE_TASK_EVENTS, itask, args)
@@ -304,6 +304,7 @@ class TaskEventsManager(object):
         itask.summary['latest_message'] = message
         if is_polled:
             itask.summary['latest_message'] += " %s" % self.POLLED_INDICATOR
+        itask.state.is_updated = True
         cylc.flags.iflag = True
 
         # Satisfy my output, if possible, and record the result.
@@ -363,12 +364,12 @@ class TaskEventsManager(object):
             except (TypeError, ValueError):
                 itask.timeout_timers[TASK_STATUS_SUBMITTED] = None
             # Believe this and change state without polling (could poll?).
-            cylc.flags.pflag = True
+            self.pflag = True
             itask.state.reset_state(TASK_STATUS_SUBMITTED)
         elif an_output_was_satisfied:
             # Message of an as-yet unreported custom task output.
             # No state change.
-            cylc.flags.pflag = True
+            self.pflag = True
             self.suite_db_mgr.put_update_task_outputs(itask)
         else:
             # Unhandled messages. These include:
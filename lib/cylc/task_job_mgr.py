@@ -114,13 +114,17 @@ class TaskJobManager(object):
         """Check submission and execution timeout and polling timers.
 
         Poll tasks that have timed out and/or have reached next polling time.
+        Only tasks that are due, or that have been touched since the last
+        check, are checked (see TaskPool.job_timers).
         """
         now = time()
         poll_tasks = set()
-        for itask in task_pool.get_tasks():
+        for itask in task_pool.job_timers.pop_due(now):
             if (self._check_timeout(itask, now) or
                     self.task_events_mgr.set_poll_time(itask, now)):
                 poll_tasks.add(itask)
+            task_pool.job_timers.set(
+                itask.identity, itask, self._get_job_deadline(itask))
         if poll_tasks:
             self.poll_task_jobs(suite, poll_tasks)
 
@@ -381,6 +385,29 @@ class TaskJobManager(object):
                     user_at_host, ' '.join(quote(item) for item in cmd),
                     proc.returncode, out, err))
 
+    def _get_job_deadline(self, itask):
+        """Return the time of the next job timer check of a task, or None.
+
+        This is the earliest of its execution time limit poll time, or else
+        its submission/execution timeout, and its next poll time.
+        """
+        deadlines = []
+        status = itask.state.status
+        timer = None
+        if status == TASK_STATUS_RUNNING:
+            timer = itask.poll_timers.get(self.KEY_EXECUTE_TIME_LIMIT)
+        if (timer is not None and timer.delay is not None and
+                timer.is_timeout_set()):
+            # Timeout is not checked until time limit polls are exhausted
+            deadlines.append(timer.timeout)
+        elif itask.timeout_timers.get(status) is not None:
+            deadlines.append(itask.timeout_timers[status])
+        timer = itask.poll_timers.get(status)
+        if timer is not None and timer.is_timeout_set():
+            deadlines.append(timer.timeout)
+        if deadlines:
+            return min(deadlines)
+
     def _check_timeout(self, itask, now):
         """Check/handle submission/execution timeouts."""
         if itask.state.status == TASK_STATUS_RUNNING:
@@ -562,6 +589,7 @@ class TaskJobManager(object):
                 'ignoring job kill result, unexpected task state: %s' %
                 itask.state.status)
         itask.summary['latest_message'] = log_msg
+        itask.state.is_updated = True
         LOG.log(log_lvl, "[%s] -job(%02d) %s" % (
             itask.identity, itask.submit_num, log_msg))
 
@@ -637,6 +665,7 @@ class TaskJobManager(object):
             ) = items[4:10]
         except IndexError:
             itask.summary['latest_message'] = 'poll failed'
+            itask.state.is_updated = True
             cylc.flags.iflag = True
             ctx.cmd = cmd_ctx.cmd  # print original command on failure
             return
@@ -848,6 +877,7 @@ class TaskJobManager(object):
         if dry_run:
             # This will be shown next to submit num in gcylc:
             itask.summary['latest_message'] = 'job file written (edit/dry-run)'
+            itask.state.is_updated = True
             LOG.debug("[%s] -%s" % (
                 itask.identity, itask.summary['latest_message']))
 
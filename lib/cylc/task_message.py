@@ -75,7 +75,6 @@ class TaskMessage(object):
         """Send messages back to the suite."""
         self._print_messages(messages)
         self._update_job_status_file(messages)
-        messages = [msg + ' at ' + self.true_event_time for msg in messages]
         try:
             self.env_map.update(
                 SuiteSrvFilesManager().load_contact_file(self.suite))
@@ -102,7 +101,10 @@ class TaskMessage(object):
         handle.flush()
 
     def _send_by_remote_port(self, messages):
-        """Send message by talking to the daemon (remote?) port."""
+        """Send messages by talking to the daemon (remote?) port.
+
+        All messages are sent in a single request.
+        """
         from cylc.network.httpclient import (
             SuiteRuntimeServiceClient, ClientError, ClientInfoError)
 
@@ -123,10 +125,12 @@ class TaskMessage(object):
                 SuiteSrvFilesManager.KEY_TASK_MSG_TIMEOUT, self.MSG_TIMEOUT)),
             comms_protocol=self.env_map.get(
                 SuiteSrvFilesManager.KEY_COMMS_PROTOCOL))
+        records = [
+            (self.task_id, self.priority, message, self.true_event_time)
+            for message in messages]
         for i in range(1, max_tries + 1):  # 1..max_tries inclusive
             try:
-                for message in messages:
-                    client.put_message(self.task_id, self.priority, message)
+                client.put_messages(records)
             except ClientError as exc:
                 sys.stderr.write("Send message: try %s of %s failed: %s\n" % (
                     i, max_tries, exc))
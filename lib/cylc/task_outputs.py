@@ -52,14 +52,23 @@ class TaskOutputs(object):
                 trigger1 = message 1
 
     Can search item by message string or by trigger string.
+
+    If "completion_handler" is set, it is called with a
+    (task name, point string, message) tuple whenever an output changes from
+    incomplete to completed. The task pool uses this to push outputs to the
+    prerequisites that subscribe to them.
     """
 
     # Memory optimization - constrain possible attributes to this list.
-    __slots__ = ["_by_message", "_by_trigger"]
+    __slots__ = ["_by_message", "_by_trigger", "_name", "_point_str",
+                 "completion_handler"]
 
     def __init__(self, tdef, point):
         self._by_message = {}
         self._by_trigger = {}
+        self._name = tdef.name
+        self._point_str = str(point)
+        self.completion_handler = None
         for trigger, message in tdef.outputs:
             self.add(message, trigger)
 
@@ -67,8 +76,10 @@ class TaskOutputs(object):
         """Add a new output message"""
         if trigger is None:
             trigger = message
-        self._by_message[message] = [trigger, message, is_completed]
+        self._by_message[message] = [trigger, message, False]
         self._by_trigger[trigger] = self._by_message[message]
+        if is_completed:
+            self._set_item_completion(self._by_message[message], True)
 
     def all_completed(self):
         """Return True if all all outputs completed."""
@@ -136,7 +147,7 @@ class TaskOutputs(object):
     def set_all_completed(self):
         """Set all outputs to complete."""
         for value in self._by_message.values():
-            value[_IS_COMPLETED] = True
+            self._set_item_completion(value, True)
 
     def set_all_incomplete(self):
         """Set all outputs to incomplete."""
@@ -146,7 +157,7 @@ class TaskOutputs(object):
     def set_completion(self, message, is_completed):
         """Set output message completion status to is_completed (bool)."""
         if message in self._by_message:
-            self._by_message[message][_IS_COMPLETED] = is_completed
+            self._set_item_completion(self._by_message[message], is_completed)
 
     def set_msg_trg_completion(self, message=None, trigger=None,
                                is_completed=True):
@@ -158,12 +169,24 @@ class TaskOutputs(object):
         """
         try:
             item = self._get_item(message, trigger)
-            old_is_completed = item[_IS_COMPLETED]
-            item[_IS_COMPLETED] = is_completed
         except KeyError:
             return None
         else:
-            return bool(old_is_completed) != bool(is_completed)
+            return self._set_item_completion(item, is_completed)
+
+    def _set_item_completion(self, item, is_completed):
+        """Set completion status of an item, notify handler if completed.
+
+        Return True if completion flag is changed, False otherwise.
+        """
+        old_is_completed = item[_IS_COMPLETED]
+        item[_IS_COMPLETED] = is_completed
+        if bool(old_is_completed) == bool(is_completed):
+            return False
+        if is_completed and self.completion_handler is not None:
+            self.completion_handler(
+                (self._name, self._point_str, item[_MESSAGE]))
+        return True
 
     def _get_item(self, message, trigger):
         """Return self._by_trigger[trigger] or self._by_message[message].
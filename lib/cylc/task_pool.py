@@ -52,10 +52,82 @@ from cylc.task_state import (
     TASK_STATUS_SUBMIT_FAILED, TASK_STATUS_SUBMIT_RETRYING,
     TASK_STATUS_RUNNING, TASK_STATUS_SUCCEEDED, TASK_STATUS_FAILED,
     TASK_STATUS_RETRYING)
+from cylc.timer_heap import TimerHeap
 from cylc.wallclock import (
     get_current_time_string, get_time_string_from_unix_time)
 
 
+class TaskStatusIndex(object):
+    """Index the task proxies of a pool by status and by cycle point.
+
+    The index is kept up to date by the "status_change_handler" of each
+    indexed task state, which is called by TaskState._set_state.
+    """
+
+    def __init__(self):
+        # {status: {id_: itask, ...}, ...}
+        self.tasks = {}
+        # {status: {point: number of tasks, ...}, ...}
+        self.points = {}
+
+    def add(self, itask):
+        """Add itask to the index."""
+        self._add(itask, itask.state.status)
+
+    def remove(self, itask):
+        """Remove itask from the index."""
+        self._remove(itask.identity, itask.state.status)
+
+    def move(self, id_, o_status, status):
+        """Move a task on a status change. Return the task proxy."""
+        itask = self._remove(id_, o_status)
+        if itask is not None:
+            self._add(itask, status)
+        return itask
+
+    def get_tasks(self, statuses=None):
+        """Return a list of tasks in "statuses", or all tasks if None."""
+        if statuses is None:
+            statuses = self.tasks.keys()
+        itasks = []
+        for status in statuses:
+            itasks.extend(self.tasks.get(status, {}).values())
+        return itasks
+
+    def get_points(self, statuses):
+        """Return a set of cycle points of tasks in "statuses"."""
+        points = set()
+        for status in statuses:
+            points.update(self.points.get(status, {}))
+        return points
+
+    def has_tasks(self, statuses):
+        """Return True if there are tasks in any of "statuses"."""
+        return any(self.tasks.get(status) for status in statuses)
+
+    def _add(self, itask, status):
+        """Add itask to the index under status."""
+        self.tasks.setdefault(status, {})[itask.identity] = itask
+        points = self.points.setdefault(status, {})
+        points[itask.point] = points.get(itask.point, 0) + 1
+
+    def _remove(self, id_, status):
+        """Remove task from the index under status. Return the task proxy."""
+        try:
+            itask = self.tasks[status].pop(id_)
+        except KeyError:
+            return None
+        if not self.tasks[status]:
+            del self.tasks[status]
+        points = self.points[status]
+        points[itask.point] -= 1
+        if not points[itask.point]:
+            del points[itask.point]
+            if not points:
+                del self.points[status]
+        return itask
+
+
 class TaskPool(object):
     """Task pool of a suite."""
 
@@ -68,6 +140,14 @@ class TaskPool(object):
     STOP_REQUEST_NOW = 'REQUEST(NOW)'
     STOP_REQUEST_NOW_NOW = 'REQUEST(NOW-NOW)'
 
+    # Statuses of tasks counted against internal queue limits.
+    QUEUE_ACTIVE_STATUSES = set([
+        TASK_STATUS_READY, TASK_STATUS_SUBMITTED, TASK_STATUS_RUNNING])
+    # Statuses of tasks that may be queued, see get_ready_tasks.
+    QUEUE_CANDIDATE_STATUSES = [
+        TASK_STATUS_WAITING, TASK_STATUS_READY, TASK_STATUS_RETRYING,
+        TASK_STATUS_SUBMIT_RETRYING]
+
     def __init__(self, config, stop_point, suite_db_mgr, task_events_mgr):
         self.config = config
         self.stop_point = stop_point
@@ -87,12 +167,34 @@ class TaskPool(object):
         self.myq = {}
         self.queues = {}
         self.assign_queues()
+        # Number of active tasks in each internal queue: {queue: n, ...}
+        self.queue_n_active = {}
+
+        # Indexes of tasks by status and by cycle point, for each pool.
+        self.status_index = TaskStatusIndex()
+        self.rh_status_index = TaskStatusIndex()
+
+        # Deadlines of main pool tasks for expiry, clock triggers and retry
+        # delays (see check_wait_timers), and for job timeouts and polls
+        # (see TaskJobManager.check_task_jobs). Tasks are touched on
+        # release and status change, as their timers may have changed.
+        self.wait_timers = TimerHeap()
+        self.job_timers = TimerHeap()
 
         self.pool_list = []
         self.rhpool_list = []
         self.pool_changed = []
         self.rhpool_changed = []
 
+        # Index of prerequisite outputs of tasks in the main pool:
+        # {(name, point_str, output): {id_: itask, ...}, ...}
+        self.output_subscriptions = {}
+        # Outputs completed in the main pool since the last dependency match:
+        # set([(name, point_str, output), ...])
+        self.new_outputs = set()
+        # Tasks to match against all existing outputs: {id_: itask, ...}
+        self.unmatched_tasks = {}
+
         self.is_held = False
         self.hold_point = None
         self.held_future_tasks = []
@@ -213,6 +315,8 @@ class TaskPool(object):
         self.runahead_pool.setdefault(itask.point, {})
         self.runahead_pool[itask.point][itask.identity] = itask
         self.rhpool_changed = True
+        self.rh_status_index.add(itask)
+        itask.state.status_change_handler = self.rh_status_index.move
 
         if is_restart:
             return itask
@@ -464,14 +568,21 @@ class TaskPool(object):
             queue = self.config.Q_DEFAULT
         self.queues.setdefault(queue, {})
         self.queues[queue][itask.identity] = itask
+        if itask.state.status in self.QUEUE_ACTIVE_STATUSES:
+            self._add_queue_n_active(queue, 1)
         self.pool.setdefault(itask.point, {})
         self.pool[itask.point][itask.identity] = itask
         self.pool_changed = True
+        self._subscribe_outputs(itask)
         LOG.debug("released to the task pool", itask=itask)
         del self.runahead_pool[itask.point][itask.identity]
         if not self.runahead_pool[itask.point]:
             del self.runahead_pool[itask.point]
         self.rhpool_changed = True
+        self.rh_status_index.remove(itask)
+        self.status_index.add(itask)
+        itask.state.status_change_handler = self._set_task_status
+        self._touch_timers(itask)
         if itask.tdef.max_future_prereq_offset is not None:
             self.set_max_future_offset()
 
@@ -485,15 +596,25 @@ class TaskPool(object):
             if not self.runahead_pool[itask.point]:
                 del self.runahead_pool[itask.point]
             self.rhpool_changed = True
+            self.rh_status_index.remove(itask)
+            itask.state.status_change_handler = None
             return
 
         # remove from queue
-        if itask.tdef.name in self.myq:  # A reload can remove a task
-            del self.queues[self.myq[itask.tdef.name]][itask.identity]
+        queue = self._get_queue(itask)
+        if queue is not None:  # A reload can remove a task
+            del self.queues[queue][itask.identity]
+            if itask.state.status in self.QUEUE_ACTIVE_STATUSES:
+                self._add_queue_n_active(queue, -1)
         del self.pool[itask.point][itask.identity]
         if not self.pool[itask.point]:
             del self.pool[itask.point]
         self.pool_changed = True
+        self.status_index.remove(itask)
+        itask.state.status_change_handler = None
+        for timers in [self.wait_timers, self.job_timers]:
+            timers.remove(itask.identity)
+        self._unsubscribe_outputs(itask)
         msg = "task proxy removed"
         if reason:
             msg += " (%s)" % reason
@@ -502,6 +623,87 @@ class TaskPool(object):
             self.set_max_future_offset()
         del itask
 
+    def _get_queue(self, itask):
+        """Return the internal queue containing a main pool task, or None."""
+        queue = self.myq.get(itask.tdef.name, self.config.Q_DEFAULT)
+        if itask.identity in self.queues.get(queue, {}):
+            return queue
+
+    def _add_queue_n_active(self, queue, delta):
+        """Adjust the number of active tasks in an internal queue."""
+        self.queue_n_active[queue] = self.queue_n_active.get(queue, 0) + delta
+
+    def _set_task_status(self, id_, o_status, status):
+        """Update indexes on status change of a task in the main pool."""
+        itask = self.status_index.move(id_, o_status, status)
+        if itask is None:
+            return
+        self._touch_timers(itask)
+        delta = (int(status in self.QUEUE_ACTIVE_STATUSES) -
+                 int(o_status in self.QUEUE_ACTIVE_STATUSES))
+        if delta:
+            queue = self._get_queue(itask)
+            if queue is not None:
+                self._add_queue_n_active(queue, delta)
+
+    def _touch_timers(self, itask):
+        """Have a main pool task checked on the next timer checks."""
+        for timers in [self.wait_timers, self.job_timers]:
+            timers.touch(itask.identity, itask)
+
+    def get_next_timer_deadline(self):
+        """Return the earliest task timer deadline, or None."""
+        deadlines = [
+            deadline for deadline in [
+                self.wait_timers.get_next_deadline(),
+                self.job_timers.get_next_deadline()]
+            if deadline is not None]
+        if deadlines:
+            return min(deadlines)
+
+    def _subscribe_outputs(self, itask):
+        """Register a main pool task for dependency matching.
+
+        Index its prerequisite outputs, push its completed outputs to
+        subscribers, and notify the pool of its future output completions.
+        """
+        for message in itask.state.prerequisites_get_messages():
+            self.output_subscriptions.setdefault(message, {})[
+                itask.identity] = itask
+        self.unmatched_tasks[itask.identity] = itask
+        itask.state.outputs.completion_handler = self.new_outputs.add
+        for output in itask.state.outputs.get_completed():
+            self.new_outputs.add((itask.tdef.name, str(itask.point), output))
+
+    def _unsubscribe_outputs(self, itask):
+        """Unregister a task removed from the main pool."""
+        itask.state.outputs.completion_handler = None
+        for message in itask.state.prerequisites_get_messages():
+            try:
+                subscribers = self.output_subscriptions[message]
+                del subscribers[itask.identity]
+            except KeyError:
+                continue
+            if not subscribers:
+                del self.output_subscriptions[message]
+        self.unmatched_tasks.pop(itask.identity, None)
+        for output in itask.state.outputs.get_completed():
+            self.new_outputs.discard(
+                (itask.tdef.name, str(itask.point), output))
+
+    def _set_unmatched(self, itask):
+        """Ask for a full match of itask, e.g. after prerequisites reset."""
+        if self._get_main_pool_task(itask.identity) is itask:
+            self.unmatched_tasks[itask.identity] = itask
+
+    def _get_main_pool_task(self, id_):
+        """Return task by ID if it is in the main pool, else None."""
+        for itask_ids in self.queues.values():
+            try:
+                return itask_ids[id_]
+            except KeyError:
+                pass
+
     def get_all_tasks(self):
         """Return a list of all task proxies."""
         return self.get_rh_tasks() + self.get_tasks()
@@ -571,44 +773,41 @@ class TaskPool(object):
         """
 
         # 1) queue unqueued tasks that are ready to run or manually forced
+        # (only waiting or retrying tasks can be ready to run, and manual
+        # triggering resets unqueued tasks to TASK_STATUS_READY)
         now = time()
-        for itask in self.get_tasks():
-            if itask.state.status != TASK_STATUS_QUEUED:
-                # only need to check that unqueued tasks are ready
-                if itask.manual_trigger or itask.ready_to_run(now):
-                    # queue the task
-                    itask.state.reset_state(TASK_STATUS_QUEUED)
-                    itask.reset_manual_trigger()
+        for itask in self.status_index.get_tasks(
+                self.QUEUE_CANDIDATE_STATUSES):
+            if itask.manual_trigger or itask.ready_to_run(now):
+                # queue the task
+                itask.state.reset_state(TASK_STATUS_QUEUED)
+                itask.reset_manual_trigger()
 
         # 2) submit queued tasks if manually forced or not queue-limited
+        # (This excludes tasks remaining TASK_STATUS_READY because job
+        # submission has been stopped with 'cylc shutdown').
         ready_tasks = []
         qconfig = self.config.cfg['scheduling']['queues']
-        for queue in self.queues:
-            # 2.1) count active tasks and compare to queue limit
-            n_active = 0
-            n_release = 0
+        n_releases = {}
+        for itask in self.status_index.get_tasks([TASK_STATUS_QUEUED]):
+            queue = self._get_queue(itask)
+            if queue is None:
+                continue
+            # 2.1) compare active tasks in the queue to the queue limit
             n_limit = qconfig[queue]['limit']
-            tasks = self.queues[queue].values()
-            if n_limit:
-                for itask in tasks:
-                    if itask.state.status in [TASK_STATUS_READY,
-                                              TASK_STATUS_SUBMITTED,
-                                              TASK_STATUS_RUNNING]:
-                        n_active += 1
-                n_release = n_limit - n_active
-
-            # 2.2) release queued tasks if not limited or if manually forced
-            for itask in tasks:
-                if not itask.state.status == TASK_STATUS_QUEUED:
-                    # (This excludes tasks remaining TASK_STATUS_READY because
-                    # job submission has been stopped with 'cylc shutdown').
-                    continue
-                if itask.manual_trigger or not n_limit or n_release > 0:
-                    # manual release, or no limit, or not currently limited
-                    n_release -= 1
-                    ready_tasks.append(itask)
-                    itask.reset_manual_trigger()
-                # else leaved queued
+            if queue not in n_releases:
+                n_releases[queue] = 0
+                if n_limit:
+                    n_releases[queue] = (
+                        n_limit - self.queue_n_active.get(queue, 0))
+
+            # 2.2) release queued task if not limited or if manually forced
+            if itask.manual_trigger or not n_limit or n_releases[queue] > 0:
+                # manual release, or no limit, or not currently limited
+                n_releases[queue] -= 1
+                ready_tasks.append(itask)
+                itask.reset_manual_trigger()
+            # else leaved queued
 
         LOG.debug('%d task(s) de-queued' % len(ready_tasks))
 
@@ -699,6 +898,11 @@ class TaskPool(object):
                     new_queues[key] = {}
                 new_queues[key][id_] = itask
         self.queues = new_queues
+        self.queue_n_active.clear()
+        for queue, itask_ids in self.queues.items():
+            for itask in itask_ids.values():
+                if itask.state.status in self.QUEUE_ACTIVE_STATUSES:
+                    self._add_queue_n_active(queue, 1)
 
         # find any old tasks that have been removed from the suite
         old_task_name_list = self.task_name_list
@@ -776,10 +980,10 @@ class TaskPool(object):
             return True
         if self.task_events_mgr.event_timers:
             return False
-        for itask in self.get_tasks():
-            if (stop_mode == self.STOP_REQUEST_CLEAN and
-                    itask.state.status in TASK_STATUSES_ACTIVE and
-                    not itask.state.kill_failed):
+        if stop_mode != self.STOP_REQUEST_CLEAN:
+            return True
+        for itask in self.status_index.get_tasks(TASK_STATUSES_ACTIVE):
+            if not itask.state.kill_failed:
                 return False
         return True
 
@@ -809,11 +1013,13 @@ class TaskPool(object):
         if self.is_held:
             return False
         can_be_stalled = False
-        for itask in self.get_tasks():
-            if itask.point > self.stop_point or itask.state.status in [
-                    TASK_STATUS_SUCCEEDED, TASK_STATUS_EXPIRED]:
+        # Ignore: Succeeded and expired tasks.
+        statuses = [
+            status for status in self.status_index.tasks
+            if status not in [TASK_STATUS_SUCCEEDED, TASK_STATUS_EXPIRED]]
+        for itask in self.status_index.get_tasks(statuses):
+            if itask.point > self.stop_point:
                 # Ignore: Task beyond stop point.
-                # Ignore: Succeeded and expired tasks.
                 continue
             if itask.state.status in TASK_STATUSES_NOT_STALLED or (
                     itask.state.status in TASK_STATUS_HELD and
@@ -886,6 +1092,7 @@ class TaskPool(object):
         itasks, bad_items = self.filter_task_proxies(items)
         for itask in itasks:
             itask.state.unset_held()
+            self._set_unmatched(itask)
         return len(bad_items)
 
     def hold_all_tasks(self):
@@ -902,38 +1109,48 @@ class TaskPool(object):
 
     def get_failed_tasks(self):
         """Return failed and submission failed tasks."""
-        failed = []
-        for itask in self.get_tasks():
-            if itask.state.status in [TASK_STATUS_FAILED,
-                                      TASK_STATUS_SUBMIT_FAILED]:
-                failed.append(itask)
-        return failed
+        return self.status_index.get_tasks(
+            [TASK_STATUS_FAILED, TASK_STATUS_SUBMIT_FAILED])
 
     def any_task_failed(self):
         """Return True if any tasks in the pool failed."""
-        for itask in self.get_tasks():
-            if itask.state.status in [TASK_STATUS_FAILED,
-                                      TASK_STATUS_SUBMIT_FAILED]:
-                return True
-        return False
+        return self.status_index.has_tasks(
+            [TASK_STATUS_FAILED, TASK_STATUS_SUBMIT_FAILED])
 
     def match_dependencies(self):
         """Run time dependency negotiation.
 
         Tasks attempt to get their prerequisites satisfied by other tasks'
-        outputs. Brokered negotiation is O(n) in number of tasks.
+        outputs. Outputs completed since the last pass are pushed to the
+        tasks that subscribe to them, so the cost is proportional to the
+        number of new outputs and new (or reset) tasks, not the pool size.
 
         """
-        all_task_outputs = set()
-        for itask in self.get_tasks():
-            for output in itask.state.outputs.get_completed():
-                all_task_outputs.add((itask.tdef.name,
-                                      str(itask.point),
-                                      output))
-        for itask in self.get_tasks():
+        # Match new (or reset) tasks against outputs already completed.
+        for itask in self.unmatched_tasks.values():
+            if not itask.state.prerequisites_are_not_all_satisfied():
+                continue
+            outputs = set()
+            for message in itask.state.prerequisites_get_messages():
+                name, point_str, output = message
+                producer = self._get_main_pool_task(
+                    TaskID.get(name, point_str))
+                if (producer is not None and
+                        producer.state.outputs.is_completed(output)):
+                    outputs.add(message)
+            if outputs:
+                itask.state.satisfy_me(outputs)
+        self.unmatched_tasks.clear()
+
+        # Push newly completed outputs to their subscribers.
+        subscribers = {}
+        for message in self.new_outputs:
+            subscribers.update(self.output_subscriptions.get(message, {}))
+        for itask in subscribers.values():
             # Try to satisfy itask if not already satisfied.
             if itask.state.prerequisites_are_not_all_satisfied():
-                itask.state.satisfy_me(all_task_outputs)
+                itask.state.satisfy_me(self.new_outputs)
+        self.new_outputs.clear()
 
     def force_spawn(self, itask):
         """Spawn successor of itask."""
@@ -999,17 +1216,21 @@ class TaskPool(object):
     def _get_earliest_unsatisfied_point(self):
         """Get earliest unsatisfied cycle point."""
         cutoff = None
-        for itask in self.get_all_tasks():
-            # this has to consider tasks in the runahead pool too, e.g.
-            # ones that have just spawned and not been released yet.
-            if itask.state.status in [TASK_STATUS_WAITING, TASK_STATUS_HELD]:
-                if cutoff is None or itask.point < cutoff:
-                    cutoff = itask.point
-            elif not itask.has_spawned:
-                # (e.g. TASK_STATUS_READY)
-                nxt = itask.next_point()
-                if nxt is not None and (cutoff is None or nxt < cutoff):
-                    cutoff = nxt
+        # this has to consider tasks in the runahead pool too, e.g.
+        # ones that have just spawned and not been released yet.
+        for index in self.rh_status_index, self.status_index:
+            points = index.get_points([TASK_STATUS_WAITING, TASK_STATUS_HELD])
+            if points and (cutoff is None or min(points) < cutoff):
+                cutoff = min(points)
+            statuses = [
+                status for status in index.tasks
+                if status not in [TASK_STATUS_WAITING, TASK_STATUS_HELD]]
+            for itask in index.get_tasks(statuses):
+                if not itask.has_spawned:
+                    # (e.g. TASK_STATUS_READY)
+                    nxt = itask.next_point()
+                    if nxt is not None and (cutoff is None or nxt < cutoff):
+                        cutoff = nxt
         return cutoff
 
     def remove_spent_tasks(self):
@@ -1035,10 +1256,9 @@ class TaskPool(object):
             return len(spent)
 
         # now check each succeeded task against the cutoff
-        for itask in self.get_tasks():
-            if (itask.state.status in [TASK_STATUS_SUCCEEDED,
-                                       TASK_STATUS_EXPIRED] and
-                    itask.has_spawned and
+        for itask in self.status_index.get_tasks(
+                [TASK_STATUS_SUCCEEDED, TASK_STATUS_EXPIRED]):
+            if (itask.has_spawned and
                     itask.cleanup_cutoff is not None and
                     cutoff > itask.cleanup_cutoff):
                 spent.append(itask)
@@ -1072,6 +1292,8 @@ class TaskPool(object):
                     itask.state.outputs.set_all_incomplete()
                 else:
                     itask.state.reset_state(status)
+                    if status == TASK_STATUS_WAITING:
+                        self._set_unmatched(itask)
                     if status in [
                             TASK_STATUS_FAILED, TASK_STATUS_SUBMIT_FAILED]:
                         itask.set_event_time('finished',
@@ -1134,30 +1356,25 @@ class TaskPool(object):
 
     def check_auto_shutdown(self):
         """Check if we should do a normal automatic shutdown."""
-        shutdown = True
-        for itask in self.get_all_tasks():
-            if self.stop_point is None:
-                # Don't if any unsucceeded task exists.
-                if itask.state.status not in [
-                        TASK_STATUS_SUCCEEDED, TASK_STATUS_EXPIRED]:
-                    shutdown = False
-                    break
-            elif (itask.point <= self.stop_point and
-                    itask.state.status not in [TASK_STATUS_SUCCEEDED,
-                                               TASK_STATUS_EXPIRED]):
-                # Don't if any unsucceeded task exists < stop point...
-                if itask.identity not in self.held_future_tasks:
+        for index in self.rh_status_index, self.status_index:
+            statuses = [
+                status for status in index.tasks
+                if status not in [TASK_STATUS_SUCCEEDED, TASK_STATUS_EXPIRED]]
+            for itask in index.get_tasks(statuses):
+                if self.stop_point is None:
+                    # Don't if any unsucceeded task exists.
+                    return False
+                elif (itask.point <= self.stop_point and
+                        itask.identity not in self.held_future_tasks):
+                    # Don't if any unsucceeded task exists < stop point...
                     # ...unless it has a future trigger extending > stop point.
-                    shutdown = False
-                    break
-        return shutdown
+                    return False
+        return True
 
     def sim_time_check(self, message_queue):
         """Simulation mode: simulate task run times and set states."""
         sim_task_state_changed = False
-        for itask in self.get_tasks():
-            if itask.state.status != TASK_STATUS_RUNNING:
-                continue
+        for itask in self.status_index.get_tasks([TASK_STATUS_RUNNING]):
             timeout = (itask.summary['started_time'] +
                        itask.tdef.rtconfig['job']['simulated run length'])
             if time() > timeout:
@@ -1166,58 +1383,77 @@ class TaskPool(object):
                         (itask.get_try_num() == 1 or
                          not conf['fail try 1 only'])):
                     message_queue.put(
-                        (itask.identity, 'CRITICAL', TASK_STATUS_FAILED))
+                        [(itask.identity, 'CRITICAL', TASK_STATUS_FAILED)])
                 else:
                     # Simulate message outputs.
-                    for msg in itask.tdef.rtconfig['outputs'].values():
-                        message_queue.put((itask.identity, 'NORMAL', msg))
-                    message_queue.put(
+                    messages = [
+                        (itask.identity, 'NORMAL', msg)
+                        for msg in itask.tdef.rtconfig['outputs'].values()]
+                    messages.append(
                         (itask.identity, 'NORMAL', TASK_STATUS_SUCCEEDED))
+                    message_queue.put(messages)
                 sim_task_state_changed = True
         return sim_task_state_changed
 
-    def set_expired_tasks(self):
-        """Check if any waiting tasks expired.
+    def check_wait_timers(self):
+        """Expire waiting tasks and check clock triggers and retry delays.
 
-        Set their status accordingly.
+        Only tasks that are due, or that have been touched since the last
+        check, are checked. Set expired tasks accordingly.
+
+        Return True if any of the checked tasks are ready to run.
         """
         now = time()
-        for itask in self.get_tasks():
-            if (itask.state.status != TASK_STATUS_WAITING or
-                    itask.tdef.expiration_offset is None):
-                continue
-            if itask.expire_time is None:
-                itask.expire_time = (
-                    itask.get_point_as_seconds() +
-                    itask.get_offset_as_seconds(itask.tdef.expiration_offset))
-            if now > itask.expire_time:
+        result = False
+        for itask in self.wait_timers.pop_due(now):
+            if (itask.state.status == TASK_STATUS_WAITING and
+                    itask.tdef.expiration_offset is not None and
+                    now > self._get_expire_time(itask)):
                 msg = 'Task expired (skipping job).'
                 LOG.warning(msg, itask=itask)
                 self.task_events_mgr.setup_event_handlers(
                     itask, "expired", msg)
                 itask.state.reset_state(TASK_STATUS_EXPIRED)
+            elif (itask.state.status in self.QUEUE_CANDIDATE_STATUSES and
+                    itask.ready_to_run(now)):
+                result = True
+            self.wait_timers.set(
+                itask.identity, itask, self._get_wait_deadline(itask, now))
+        return result
 
-    def waiting_tasks_ready(self):
-        """Waiting tasks can become ready for internal reasons.
+    @staticmethod
+    def _get_expire_time(itask):
+        """Return (and remember) the expiry time of a task."""
+        if itask.expire_time is None:
+            itask.expire_time = (
+                itask.get_point_as_seconds() +
+                itask.get_offset_as_seconds(itask.tdef.expiration_offset))
+        return itask.expire_time
 
-        Namely clock-triggers or retry-delay timers
+    def _get_wait_deadline(self, itask, now):
+        """Return the time of the next wait timer check of a task, or None.
 
+        This is the earliest of its expiry time, if waiting, and its clock
+        trigger time or retry delay timeout, if not yet reached.
         """
-        now = time()
-        result = False
-        for itask in self.get_tasks():
-            if itask.ready_to_run(now):
-                result = True
-                break
-        return result
+        deadlines = []
+        status = itask.state.status
+        if (status == TASK_STATUS_WAITING and
+                itask.tdef.expiration_offset is not None):
+            deadlines.append(self._get_expire_time(itask))
+        if status in self.QUEUE_CANDIDATE_STATUSES:
+            if not itask.start_time_reached(now):
+                deadlines.append(itask.delayed_start)
+            elif (status in itask.try_timers and
+                    itask.try_timers[status].is_timeout_set() and
+                    not itask.try_timers[status].is_delay_done(now)):
+                deadlines.append(itask.try_timers[status].timeout)
+        if deadlines:
+            return min(deadlines)
 
     def task_succeeded(self, id_):
         """Return True if task with id_ is in the succeeded state."""
-        for itask in self.get_tasks():
-            if (itask.identity == id_ and
-                    itask.state.status == TASK_STATUS_SUCCEEDED):
-                return True
-        return False
+        return id_ in self.status_index.tasks.get(TASK_STATUS_SUCCEEDED, {})
 
     def ping_task(self, id_, exists_only=False):
         """Return message to indicate if task exists and/or is running."""
@@ -163,13 +163,18 @@ class TaskState(object):
     __slots__ = ["identity", "status", "hold_swap",
                  "_is_satisfied", "_suicide_is_satisfied", "prerequisites",
                  "suicide_prerequisites", "external_triggers", "outputs",
-                 "kill_failed", "time_updated", "confirming_with_poll"]
+                 "kill_failed", "time_updated", "confirming_with_poll",
+                 "is_updated", "status_change_handler"]
 
     def __init__(self, tdef, point, status, hold_swap):
         self.identity = TaskID.get(tdef.name, str(point))
         self.status = status
         self.hold_swap = hold_swap
         self.time_updated = None
+        # Dirty flag for the state summary, reset by StateSummaryMgr.
+        self.is_updated = True
+        # Called with (identity, old status, new status) on status change.
+        self.status_change_handler = None
 
         self._is_satisfied = None
         self._suicide_is_satisfied = None
@@ -226,6 +231,13 @@ class TaskState(object):
                 preq.is_satisfied() for preq in self.suicide_prerequisites)
         return self._suicide_is_satisfied
 
+    def prerequisites_get_messages(self):
+        """Return a set of (name, point string, output) required by (any)
+        prerequisites."""
+        return set(message for prereqs in [
+            self.prerequisites, self.suicide_prerequisites]
+            for prereq in prereqs for message in prereq.satisfied)
+
     def prerequisites_get_target_points(self):
         """Return a list of cycle points targeted by each prerequisite."""
         return set(point for prerequisite in self.prerequisites for
@@ -382,6 +394,10 @@ class TaskState(object):
             self.hold_swap = None
         self.status = status
         self.time_updated = get_current_time_string()
+        self.is_updated = True
+        if (self.status_change_handler is not None and
+                o_status != self.status):
+            self.status_change_handler(self.identity, o_status, self.status)
         flags.iflag = True
         # Log
         message = str(o_status)
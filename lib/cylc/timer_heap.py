@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2017 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Deadline-ordered timers, so that the main loop only looks at what is due.
+
+Each item, e.g. a task proxy, has at most one deadline, which is the
+earliest time at which something may need doing to it. Items can also be
+"touched" to have them returned by the next "pop_due" regardless of their
+deadlines, e.g. when a change of task status may have changed its timers.
+The owner of the items checks each item returned by "pop_due", and then
+sets its next deadline, if any.
+"""
+
+from heapq import heapify, heappop, heappush
+import unittest
+
+
+class TimerHeap(object):
+    """A heap of item deadlines, with items to check on the next pop."""
+
+    # Rebuild the heap when it holds this many times more entries than
+    # there are live deadlines.
+    MAX_STALE_RATIO = 4
+
+    def __init__(self):
+        # [(deadline, seq, key), ...]
+        self.heap = []
+        # {key: (deadline, seq, item), ...}
+        self.deadlines = {}
+        # {key: item, ...}
+        self.touched = {}
+        self.seq = 0
+
+    def __contains__(self, key):
+        return key in self.deadlines or key in self.touched
+
+    def __len__(self):
+        return len(set(self.deadlines) | set(self.touched))
+
+    def set(self, key, item, deadline):
+        """Set (or unset if deadline is None) the deadline of key."""
+        if deadline is None:
+            self.deadlines.pop(key, None)
+            return
+        old = self.deadlines.get(key)
+        if old is not None and old[0] == deadline:
+            self.deadlines[key] = (deadline, old[1], item)
+            return
+        # Any old heap entry of key is now stale, and is skipped on pop.
+        self.seq += 1
+        self.deadlines[key] = (deadline, self.seq, item)
+        heappush(self.heap, (deadline, self.seq, key))
+        if len(self.heap) > self.MAX_STALE_RATIO * (len(self.deadlines) + 1):
+            self.heap = [
+                (deadline, seq, key_)
+                for key_, (deadline, seq, _) in self.deadlines.items()]
+            heapify(self.heap)
+
+    def touch(self, key, item):
+        """Return item from the next pop_due, whatever its deadline."""
+        self.touched[key] = item
+
+    def remove(self, key):
+        """Forget key."""
+        self.deadlines.pop(key, None)
+        self.touched.pop(key, None)
+
+    def pop_due(self, now):
+        """Remove and return the items that are touched or due at now."""
+        items = self.touched
+        self.touched = {}
+        while self.heap and self.heap[0][0] <= now:
+            deadline, seq, key = heappop(self.heap)
+            try:
+                if self.deadlines[key][1] != seq:
+                    continue  # stale entry
+            except KeyError:
+                continue  # removed
+            items[key] = self.deadlines.pop(key)[2]
+        return items.values()
+
+    def get_next_deadline(self):
+        """Return the earliest deadline, or None if there is none.
+
+        Touched items are not taken into account.
+        """
+        while self.heap:
+            deadline, seq, key = self.heap[0]
+            try:
+                if self.deadlines[key][1] == seq:
+                    return deadline
+            except KeyError:
+                pass
+            heappop(self.heap)
+        return None
+
+
+class TestTimerHeap(unittest.TestCase):
+    """Unit tests for TimerHeap."""
+
+    def test_pop_due(self):
+        """Test that only due and touched items are popped, in order."""
+        timers = TimerHeap()
+        timers.set('a', 'item a', 10.0)
+        timers.set('b', 'item b', 5.0)
+        timers.set('c', 'item c', 20.0)
+        self.assertEqual(timers.get_next_deadline(), 5.0)
+        self.assertEqual(timers.pop_due(4.0), [])
+        self.assertEqual(timers.pop_due(5.0), ['item b'])
+        self.assertEqual(timers.pop_due(5.0), [])
+        timers.touch('c', 'item c')
+        self.assertEqual(timers.pop_due(5.0), ['item c'])
+        self.assertEqual(timers.get_next_deadline(), 10.0)
+        self.assertEqual(sorted(timers.pop_due(30.0)), ['item a', 'item c'])
+        self.assertEqual(timers.get_next_deadline(), None)
+        self.assertEqual(len(timers), 0)
+
+    def test_reset_and_remove(self):
+        """Test that old deadlines are forgotten on set and remove."""
+        timers = TimerHeap()
+        timers.set('a', 'item a', 10.0)
+        timers.set('a', 'item a', 30.0)
+        timers.set('b', 'item b', 5.0)
+        timers.set('b', 'item b', None)
+        timers.set('c', 'item c', 1.0)
+        timers.touch('c', 'item c')
+        timers.remove('c')
+        self.assertFalse('c' in timers)
+        self.assertEqual(timers.get_next_deadline(), 30.0)
+        self.assertEqual(timers.pop_due(20.0), [])
+        self.assertEqual(timers.pop_due(30.0), ['item a'])
+
+    def test_compact(self):
+        """Test that stale heap entries do not accumulate."""
+        timers = TimerHeap()
+        for i in range(1000):
+            timers.set('a', 'item a', float(i))
+        self.assertTrue(len(timers.heap) <= 2 * TimerHeap.MAX_STALE_RATIO)
+        self.assertEqual(timers.pop_due(998.0), [])
+        self.assertEqual(timers.pop_due(999.0), ['item a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2017 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Wake up the suite daemon main loop when there is work to do.
+
+The main loop blocks on a MainLoopWakeUp instead of sleeping for a fixed
+interval. Producers of work in other threads (the HTTP server threads
+feeding the command, message and external trigger queues) call its "set"
+method to end the wait early. The wait can also end when other file
+descriptors, e.g. the output pipes of process pool commands, are readable.
+
+A self-pipe is used rather than threading.Event, because in Python 2 a
+timed Event.wait polls with sleeps of up to 50ms instead of blocking.
+"""
+
+import errno
+import fcntl
+import os
+from Queue import Queue
+import select
+
+
+class MainLoopWakeUp(object):
+    """Let other threads wake up a main loop blocked in "wait"."""
+
+    def __init__(self):
+        self.read_fd, self.write_fd = os.pipe()
+        for fd in (self.read_fd, self.write_fd):
+            flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+            fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+            flags = fcntl.fcntl(fd, fcntl.F_GETFD)
+            fcntl.fcntl(fd, fcntl.F_SETFD, flags | fcntl.FD_CLOEXEC)
+
+    def close(self):
+        """Close the pipe."""
+        for fd in (self.read_fd, self.write_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def set(self, *_):
+        """Wake up the main loop.
+
+        Accept and ignore any arguments, so this can be used directly as a
+        callback.
+        """
+        try:
+            os.write(self.write_fd, "x")
+        except OSError:
+            # Pipe full (a wake up is already pending) or closed.
+            pass
+
+    def wait(self, timeout, fds=None):
+        """Block for up to "timeout" seconds, or until "set" is called.
+
+        If "fds" is specified, also stop blocking when any of these file
+        descriptors is readable. (It is up to the caller to read them.)
+
+        Return True if woken up by a call to "set" or a readable "fds".
+        """
+        fds = [self.read_fd] + list(fds or [])
+        try:
+            readable = select.select(fds, [], [], timeout)[0]
+        except select.error as exc:
+            if exc.args[0] != errno.EINTR:
+                raise
+            return False
+        if not readable:
+            return False
+        if self.read_fd not in readable:
+            return True
+        # Drain all pending wake ups.
+        try:
+            while os.read(self.read_fd, 4096):
+                pass
+        except OSError:
+            pass
+        return True
+
+
+class WakeUpQueue(Queue):
+    """A Queue that wakes up the main loop when an item is put on it."""
+
+    def __init__(self, wakeup, maxsize=0):
+        Queue.__init__(self, maxsize)
+        self.wakeup = wakeup
+
+    def put(self, item, block=True, timeout=None):
+        """Put an item into the queue, and wake up the main loop."""
+        Queue.put(self, item, block, timeout)
+        self.wakeup.set()
@@ -0,0 +1,47 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2017 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#------------------------------------------------------------------------------
+# Test "cylc message" with multiple messages. They should all be sent to the
+# suite in a single "put_messages" request.
+
+. "$(dirname "$0")/test_header"
+
+set_test_number 4
+install_suite "${TEST_NAME_BASE}" "${TEST_NAME_BASE}"
+
+run_ok "${TEST_NAME_BASE}-validate" cylc validate "${SUITE_NAME}"
+
+suite_run_ok "${TEST_NAME_BASE}-run" cylc run --debug "${SUITE_NAME}"
+
+LOG="${SUITE_RUN_DIR}/log/suite/log"
+grep -F '[foo.1]' "${LOG}" | sed -n 's/^.*)\(> .*\) at .*$/\1/p' \
+    >'foo-messages.log'
+cmp_ok 'foo-messages.log' <<'__LOG__'
+> started
+> file 1 done
+> file 2 done
+> succeeded
+__LOG__
+# One request per "cylc message" command: foo sends started, its two custom
+# messages and succeeded; bar sends started and succeeded.
+grep -c '\[client-command\] put_messages .*cylc-message' "${LOG}" \
+    >'put-messages.count'
+cmp_ok 'put-messages.count' <<<'5'
+
+purge_suite "${SUITE_NAME}"
+exit